@@ -1,20 +1,19 @@
 #!/usr/bin/env python3
 ## config/config.py
 """Handles project configuration and environment variables."""
+import functools
 import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
+from typing import Mapping
 
-load_dotenv()
 
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
-    client_id: str = os.getenv("ML_CLIENT_ID")
-    client_secret: str = os.getenv("ML_CLIENT_SECRET")
-    redirect_uri: str = os.getenv("ML_REDIRECT_URI")
-    timeout: int = int(os.getenv("API_TIMEOUT", 30))
-    rate_limit: int = int(os.getenv("RATE_LIMIT", 100))
+    client_id: str = None
+    client_secret: str = None
+    redirect_uri: str = None
+    timeout: int = 30
+    rate_limit: int = 100
 
     # API URLs
     api_url: str = "https://api.mercadolibre.com"
@@ -23,10 +22,49 @@ class Config:
     # Files
     token_file: str = "ml_tokens.json"
 
-    # Fallback tokens
-    fallback_access: str = os.getenv("ACCESS_TOKEN")
-    fallback_refresh: str = os.getenv("REFRESH_TOKEN")
-    fallback_expires: str = os.getenv("TOKEN_EXPIRES")
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "Config":
+        """Build a configuration from an environment snapshot."""
+        return cls(
+            client_id=env.get("ML_CLIENT_ID"),
+            client_secret=env.get("ML_CLIENT_SECRET"),
+            redirect_uri=env.get("ML_REDIRECT_URI"),
+            timeout=int(env.get("API_TIMEOUT", "30")),
+            rate_limit=int(env.get("RATE_LIMIT", "100")),
+        )
+
+
+@functools.cache
+def get_config() -> Config:
+    """Load .env on first use and build the shared configuration."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    # Single snapshot of the environment, taken once after .env is loaded
+    return Config.from_env(dict(os.environ))
+
+
+# Fallback tokens, only consulted when the token file is missing
+@functools.cache
+def fallback_access() -> str:
+    get_config()  # ensures .env has been loaded
+    return os.getenv("ACCESS_TOKEN")
+
+
+@functools.cache
+def fallback_refresh() -> str:
+    get_config()
+    return os.getenv("REFRESH_TOKEN")
+
+
+@functools.cache
+def fallback_expires() -> str:
+    get_config()
+    return os.getenv("TOKEN_EXPIRES")
 
 
-cfg = Config()
+def __getattr__(name):
+    # `cfg` is resolved lazily so importing this module doesn't parse .env
+    if name == "cfg":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
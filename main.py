@@ -22,26 +22,43 @@ python main.py 354140329 orders   # Orders only
 
 python main.py 354140329 full     # Both pipelines
 
+Large initial load (indexes rebuilt once at the end):
+
+python main.py --bulk
+
 """
 
 import sys
 import logging
+import logging.handlers
 import os
-import json
-from typing import List, Dict, Optional, Any
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from collections import Counter
+from itertools import islice
+import orjson
+from typing import List, Dict, Optional, Any, Set, Tuple, NamedTuple
 from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
-from src.extractors.items_extractor import extract_items_with_enrichments
-from src.extractors.orders_extractor import extract_orders
-from src.transformers.product_enricher import enrich_items
-from src.transformers.order_enricher import enrich_orders
-from src.loaders.data_loader import load_items_to_db, load_orders_to_db
-from src.extractors.ml_api_client import create_client
+# Extractor/transformer/loader modules pull in requests and SQLAlchemy, so they
+# are imported inside the pipeline methods that use them to keep startup fast.
+
+# Directories already created by this process
+_ensured_dirs: Set[str] = set()
+
+
+def _ensure_dir(path: str):
+    """Create a directory once per process, skipping the syscall afterwards."""
+    if path and path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineConfig:
     """Configuration class for ETL pipeline."""
 
@@ -64,6 +81,11 @@ class PipelineConfig:
 
     # Default sellers for multi-seller runs
     default_sellers: List[str] = None
+    max_seller_workers: int = 8  # Sellers processed concurrently (API-bound)
+
+    # Large initial loads: drop secondary indexes for the run and rebuild them
+    # once at the end instead of updating them row by row (also: --bulk)
+    bulk_load: bool = False
 
     # Logging configuration
     log_level: str = "INFO"
@@ -98,21 +120,33 @@ class PipelineConfig:
         """Save configuration to JSON file in organized structure."""
         if filepath is None:
             # Create config directory and use default path
-            os.makedirs("config", exist_ok=True)
+            _ensure_dir("config")
             filepath = "config/pipeline_configs.json"
 
         # Ensure directory exists
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        _ensure_dir(os.path.dirname(filepath))
+
+        with open(filepath, "wb") as f:
+            f.write(self.to_json())
 
-        with open(filepath, "w") as f:
-            json.dump(asdict(self), f, indent=2, default=str)
+    def to_json(self) -> bytes:
+        """Serialize the configuration to indented JSON bytes."""
+        return orjson.dumps(asdict(self), option=orjson.OPT_INDENT_2)
 
     @classmethod
     def load_from_file(cls, filepath: str) -> "PipelineConfig":
         """Load configuration from JSON file."""
-        with open(filepath, "r") as f:
-            data = json.load(f)
-        return cls(**data)
+        return cls(**orjson.loads(Path(filepath).read_bytes()))
+
+
+# Formatters are stateless, so every pipeline logger shares these instances
+_DETAILED_FMT = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+_SIMPLE_FMT = logging.Formatter(
+    "%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S"
+)
 
 
 class ImprovedPipelineLogger:
@@ -120,6 +154,8 @@ class ImprovedPipelineLogger:
 
     def __init__(self, config: PipelineConfig):
         self.config = config
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._queue_handler: Optional[logging.handlers.QueueHandler] = None
         self.logger = self._setup_logger()
 
     def _setup_logger(self) -> logging.Logger:
@@ -130,19 +166,9 @@ class ImprovedPipelineLogger:
         # Clear existing handlers
         logger.handlers.clear()
 
-        # Create formatters
-        detailed_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-
-        simple_formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S"
-        )
-
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(simple_formatter)
+        console_handler.setFormatter(_SIMPLE_FMT)
         console_handler.setLevel(logging.INFO)
         logger.addHandler(console_handler)
 
@@ -150,13 +176,23 @@ class ImprovedPipelineLogger:
         if self.config.log_to_file:
             # Create organized log directory structure
             log_dir = "logs/pipeline_logs"
-            os.makedirs(log_dir, exist_ok=True)
+            _ensure_dir(log_dir)
 
             log_file_path = os.path.join(log_dir, self.config.log_file)
             file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
-            file_handler.setFormatter(detailed_formatter)
+            file_handler.setFormatter(_DETAILED_FMT)
             file_handler.setLevel(logging.DEBUG)
-            logger.addHandler(file_handler)
+
+            # Route file records through a queue so disk I/O happens on the
+            # listener thread instead of the pipeline thread. The handler
+            # still flushes each record, so the log survives a crash
+            log_queue = queue.SimpleQueue()
+            self._queue_handler = logging.handlers.QueueHandler(log_queue)
+            logger.addHandler(self._queue_handler)
+            self._listener = logging.handlers.QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            self._listener.start()
 
         return logger
 
@@ -164,17 +200,49 @@ class ImprovedPipelineLogger:
         """Get the configured logger instance."""
         return self.logger
 
+    def close(self):
+        """Stop the file listener, flushing any queued records to disk."""
+        if self._listener is None:
+            return
+
+        self.logger.removeHandler(self._queue_handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+        self._queue_handler = None
+
+
+class SellerResult(NamedTuple):
+    """Outcome of one pipeline run for one seller."""
+
+    success: bool
+    records_processed: int
+    error: Optional[str]
+
 
 class PipelineResults:
     """Track and manage pipeline execution results."""
 
     def __init__(self):
         self.start_time = datetime.now()
+        self.timestamp_str = self.start_time.strftime("%Y%m%d_%H%M%S")
         self.end_time = None
-        self.results = {}
+        self.duration = None
+        # Flat (seller_id, pipeline_type) -> SellerResult map; see by_seller()
+        self.results: Dict[Tuple[str, str], SellerResult] = {}
         self.errors = []
         self.warnings = []
 
+        # Sellers may be processed concurrently
+        self._lock = threading.Lock()
+
+        # Running counters so get_summary() doesn't rescan every seller
+        self._sellers: Set[str] = set()
+        self._successful = Counter()
+        self._failed_per_seller = Counter()
+        self._fully_successful = 0
+
     def add_seller_result(
         self,
         seller_id: str,
@@ -184,82 +252,106 @@ class PipelineResults:
         error_msg: str = None,
     ):
         """Add result for a specific seller and pipeline type."""
-        if seller_id not in self.results:
-            self.results[seller_id] = {}
-
-        self.results[seller_id][pipeline_type] = {
-            "success": success,
-            "records_processed": records_processed,
-            "error": error_msg,
-        }
-
-        if error_msg:
-            self.errors.append(f"{seller_id} ({pipeline_type}): {error_msg}")
+        with self._lock:
+            # A seller is fully successful when it has results and none failed
+            failed = self._failed_per_seller
+            was_fully_successful = seller_id in self._sellers and not failed[seller_id]
+            self._sellers.add(seller_id)
+
+            # Replace any earlier result for this pipeline in the counters
+            key = (seller_id, pipeline_type)
+            previous = self.results.get(key)
+            if previous is not None:
+                if previous.success:
+                    self._successful[pipeline_type] -= 1
+                else:
+                    failed[seller_id] -= 1
+
+            self.results[key] = SellerResult(success, records_processed, error_msg)
+
+            if success:
+                self._successful[pipeline_type] += 1
+            else:
+                failed[seller_id] += 1
+            self._fully_successful += (not failed[seller_id]) - was_fully_successful
+
+            if error_msg:
+                self.errors.append(f"{seller_id} ({pipeline_type}): {error_msg}")
+
+    def by_seller(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Group results as {seller_id: {pipeline_type: {...}}} for reporting."""
+        grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (seller_id, pipeline_type), result in self.results.items():
+            grouped.setdefault(seller_id, {})[pipeline_type] = result._asdict()
+        return grouped
 
     def add_warning(self, message: str):
         """Add a warning message."""
-        self.warnings.append(message)
+        with self._lock:
+            self.warnings.append(message)
 
     def finalize(self):
         """Finalize results and calculate summary statistics."""
-        self.end_time = datetime.now()
-        self.duration = (self.end_time - self.start_time).total_seconds()
+        # One clock read for both the end time and the duration
+        now = datetime.now()
+        self.end_time = now
+        self.duration = (now - self.start_time).total_seconds()
 
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics."""
         if not self.end_time:
             self.finalize()
 
-        total_sellers = len(self.results)
-        items_successful = sum(
-            1 for r in self.results.values() if r.get("items", {}).get("success", False)
-        )
-        orders_successful = sum(
-            1
-            for r in self.results.values()
-            if r.get("orders", {}).get("success", False)
-        )
-        fully_successful = sum(
-            1
-            for r in self.results.values()
-            if all(pipeline.get("success", False) for pipeline in r.values())
-        )
-
         return {
             "duration": self.duration,
-            "total_sellers": total_sellers,
-            "items_successful": items_successful,
-            "orders_successful": orders_successful,
-            "fully_successful": fully_successful,
+            "total_sellers": len(self._sellers),
+            "items_successful": self._successful["items"],
+            "orders_successful": self._successful["orders"],
+            "fully_successful": self._fully_successful,
             "total_errors": len(self.errors),
             "total_warnings": len(self.warnings),
         }
 
-    def save_to_file(self, filepath: str = None):
-        """Save results to JSON file in organized structure."""
+    def _jsonable(self) -> Tuple[Tuple[str, Any], ...]:
+        """Top-level result sections, already reduced to plain JSON types."""
+        summary = self.get_summary()  # finalizes end_time/duration if needed
+        return (
+            ("start_time", self.start_time.isoformat()),
+            ("end_time", self.end_time.isoformat() if self.end_time else None),
+            ("duration", self.duration),
+            ("results", self.by_seller()),
+            ("errors", self.errors),
+            ("warnings", self.warnings),
+            ("summary", summary),
+        )
+
+    def save_to_file(self, filepath: str = None) -> str:
+        """Save results to JSON file in organized structure and return its path."""
         if filepath is None:
             # Create organized results directory and use timestamped filename
             results_dir = "logs/pipeline_results"
-            os.makedirs(results_dir, exist_ok=True)
+            _ensure_dir(results_dir)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(results_dir, f"pipeline_results_{timestamp}.json")
+            filepath = os.path.join(
+                results_dir, f"pipeline_results_{self.timestamp_str}.json"
+            )
         else:
             # Ensure directory exists for custom filepath
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
-        data = {
-            "start_time": self.start_time.isoformat(),
-            "end_time": self.end_time.isoformat() if self.end_time else None,
-            "duration": getattr(self, "duration", None),
-            "results": self.results,
-            "errors": self.errors,
-            "warnings": self.warnings,
-            "summary": self.get_summary(),
-        }
+            _ensure_dir(os.path.dirname(filepath))
+
+        # Stream one top-level key at a time instead of building a merged dict;
+        # nested lines are shifted one level to match a single indented dump
+        with open(filepath, "wb", buffering=1 << 20) as f:
+            f.write(b"{")
+            for index, (key, value) in enumerate(self._jsonable()):
+                f.write(b",\n  " if index else b"\n  ")
+                f.write(orjson.dumps(key))
+                f.write(b": ")
+                encoded = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+                f.write(encoded.replace(b"\n", b"\n  "))
+            f.write(b"\n}")
 
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        return filepath
 
 
 class ImprovedETLPipeline:
@@ -270,32 +362,74 @@ class ImprovedETLPipeline:
         self.logger_setup = ImprovedPipelineLogger(config)
         self.logger = self.logger_setup.get_logger()
         self.results = PipelineResults()
+        # One engine (and connection pool) shared by every load in this run
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        # Sellers run concurrently but SQLite takes one writer at a time, so
+        # loads are serialized here instead of failing with "database is locked"
+        self._db_write_lock = threading.Lock()
+
+    def _get_engine(self):
+        """Create the shared database engine on first use."""
+        with self._engine_lock:
+            if self._engine is None:
+                from src.loaders.data_loader import create_db_engine
+
+                self._engine = create_db_engine(self.config.db_url)
+            return self._engine
+
+    def bulk_load_context(self):
+        """
+        Context for a run's loads: defers secondary index maintenance when
+        config.bulk_load is set, otherwise does nothing.
+        """
+        if not self.config.bulk_load:
+            return nullcontext()
+        from src.models.models import secondary_indexes_deferred
+
+        self.logger.info("Bulk load: secondary indexes rebuilt after the run")
+        return secondary_indexes_deferred(self._get_engine())
 
     def validate_environment(self) -> bool:
         """Validate environment and API connectivity."""
+        from src.extractors.ml_api_client import create_client
+
         self.logger.info("Validating environment and API connectivity...")
 
         try:
             # Create data directory
-            os.makedirs("./data", exist_ok=True)
+            _ensure_dir("./data")
 
             # Test API connection
             client, token = create_client()
             user_info = client.get_user(token)
             self.logger.info(
-                f"✓ API connection successful. User: {user_info.get('nickname', 'Unknown')}"
+                "✓ API connection successful. User: %s",
+                user_info.get("nickname", "Unknown"),
             )
 
-            # Validate seller IDs
-            for seller_id in self.config.default_sellers:
+            # Validate seller IDs - probes share one client/token and run
+            # concurrently, so validation costs ~1 round-trip instead of one per seller
+            sellers = self.config.default_sellers
+            with ThreadPoolExecutor(max_workers=max(1, min(16, len(sellers)))) as ex:
+                probes = [
+                    ex.submit(client.get_items, token, seller_id, limit=1)
+                    for seller_id in sellers
+                ]
+
+            for seller_id, probe in zip(sellers, probes):
                 try:
                     # Quick test to validate seller exists
-                    test_items = client.get_items(token, seller_id, limit=1)
+                    test_items = probe.result()
                     self.logger.info(
-                        f"✓ Seller {seller_id} validated ({len(test_items)} items available)"
+                        "✓ Seller %s validated (%d items available)",
+                        seller_id,
+                        len(test_items),
                     )
                 except Exception as e:
-                    self.logger.warning(f"⚠ Seller {seller_id} validation failed: {e}")
+                    self.logger.warning(
+                        "⚠ Seller %s validation failed: %s", seller_id, e
+                    )
                     self.results.add_warning(
                         f"Seller {seller_id} validation failed: {e}"
                     )
@@ -303,74 +437,91 @@ class ImprovedETLPipeline:
             return True
 
         except Exception as e:
-            self.logger.error(f"❌ Environment validation failed: {e}")
+            self.logger.error("❌ Environment validation failed: %s", e)
             return False
 
     def run_items_pipeline(self, seller_id: str) -> bool:
         """Execute items ETL pipeline for a single seller with enhanced error handling."""
-        self.logger.info(f"Starting ITEMS pipeline for seller {seller_id}")
+        from src.extractors.items_extractor import (
+            RAW_ITEM_FIELDS,
+            iter_items_with_enrichments,
+        )
+        from src.transformers.product_enricher import enrich_items
+        from src.loaders.data_loader import ITEM_LOAD_CHUNK, load_items_to_db
+
+        self.logger.info("Starting ITEMS pipeline for seller %s", seller_id)
 
         try:
-            # Extract with enrichments
-            self.logger.info("Extracting items with enrichments...")
-            raw_items = extract_items_with_enrichments(
+            self.logger.info("Extracting, enriching and loading items...")
+            raw_items = iter_items_with_enrichments(
                 seller_id=seller_id,
                 limit=self.config.max_items_per_seller,
                 include_descriptions=self.config.include_descriptions,
                 include_reviews=self.config.include_reviews,
+                # Only enrich_items reads the raw items, so skip the rest
+                attrs=RAW_ITEM_FIELDS,
             )
 
-            if not raw_items:
-                self.logger.warning(f"No items extracted for seller {seller_id}")
+            # Items stream through one chunk at a time, as orders do, so the
+            # seller's catalog is never held in memory all at once
+            extracted = 0
+            enriched = 0
+            while raw_chunk := list(islice(raw_items, ITEM_LOAD_CHUNK)):
+                extracted += len(raw_chunk)
+                enriched_items = enrich_items(raw_chunk)
+                enriched += len(enriched_items)
+                with self._db_write_lock:
+                    load_items_to_db(
+                        enriched_items, self.config.db_url, engine=self._get_engine()
+                    )
+
+            if not extracted:
+                self.logger.warning("No items extracted for seller %s", seller_id)
                 self.results.add_seller_result(
                     seller_id, "items", False, 0, "No items found"
                 )
                 return False
 
-            self.logger.info(f"✓ Extracted {len(raw_items)} items")
-
-            # Transform
-            self.logger.info("Enriching items...")
-            enriched_items = enrich_items(raw_items)
+            self.logger.info("✓ Extracted %d items", extracted)
 
-            if not enriched_items:
+            if not enriched:
                 error_msg = "Items enrichment failed - no items to load"
                 self.logger.error(error_msg)
                 self.results.add_seller_result(seller_id, "items", False, 0, error_msg)
                 return False
 
-            self.logger.info(f"✓ Enriched {len(enriched_items)} items")
-
-            # Load
-            self.logger.info("Loading items to database...")
-            load_items_to_db(enriched_items, self.config.db_url)
+            self.logger.info("✓ Enriched and loaded %d items", enriched)
 
             self.logger.info(
-                f"✅ Items pipeline completed successfully for seller {seller_id}"
-            )
-            self.results.add_seller_result(
-                seller_id, "items", True, len(enriched_items)
+                "✅ Items pipeline completed successfully for seller %s", seller_id
             )
+            self.results.add_seller_result(seller_id, "items", True, enriched)
             return True
 
         except Exception as e:
             error_msg = f"Items pipeline failed: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            self.logger.error("❌ %s", error_msg)
             self.results.add_seller_result(seller_id, "items", False, 0, str(e))
             return False
 
     def run_orders_pipeline(self, seller_id: str) -> bool:
         """Execute orders ETL pipeline for a single seller with enhanced error handling."""
-        self.logger.info(f"Starting ORDERS pipeline for seller {seller_id}")
+        from src.extractors.orders_extractor import iter_orders
+        from src.transformers.order_enricher import enrich_orders
+        from src.loaders.data_loader import ORDER_LOAD_CHUNK, load_orders_to_db
+
+        self.logger.info("Starting ORDERS pipeline for seller %s", seller_id)
 
         try:
             self.logger.info(
-                f"Date range: {self.config.orders_date_from} to {self.config.orders_date_to}"
+                "Date range: %s to %s",
+                self.config.orders_date_from,
+                self.config.orders_date_to,
             )
 
             # Extract with proper pagination limit
-            self.logger.info("Extracting orders...")
-            raw_orders = extract_orders(
+            self.logger.info("Extracting, enriching and loading orders...")
+            raw_orders = iter_orders(
                 seller_id=seller_id,
                 date_from=self.config.orders_date_from,
                 date_to=self.config.orders_date_to,
@@ -378,48 +529,51 @@ class ImprovedETLPipeline:
                 max_records=self.config.max_orders_per_seller,
             )
 
-            if not raw_orders:
-                self.logger.warning(f"No orders extracted for seller {seller_id}")
+            # Orders stream through one chunk at a time, so only a chunk is
+            # ever held in memory and loading starts with the first pages
+            extracted = 0
+            enriched = 0
+            while raw_chunk := list(islice(raw_orders, ORDER_LOAD_CHUNK)):
+                extracted += len(raw_chunk)
+                enriched_orders = enrich_orders(raw_chunk)
+                enriched += len(enriched_orders)
+                with self._db_write_lock:
+                    load_orders_to_db(
+                        enriched_orders, self.config.db_url, engine=self._get_engine()
+                    )
+
+            if not extracted:
+                self.logger.warning("No orders extracted for seller %s", seller_id)
                 self.results.add_seller_result(
                     seller_id, "orders", False, 0, "No orders found"
                 )
                 return False
 
-            self.logger.info(f"✓ Extracted {len(raw_orders)} orders")
-
-            # Transform
-            self.logger.info("Enriching orders...")
-            enriched_orders = enrich_orders(raw_orders)
+            self.logger.info("✓ Extracted %d orders", extracted)
 
-            if not enriched_orders:
+            if not enriched:
                 error_msg = "Orders enrichment failed - no orders to load"
                 self.logger.error(error_msg)
                 self.results.add_seller_result(seller_id, "orders", False, 0, error_msg)
                 return False
 
-            self.logger.info(f"✓ Enriched {len(enriched_orders)} orders")
-
-            # Load
-            self.logger.info("Loading orders to database...")
-            load_orders_to_db(enriched_orders, self.config.db_url)
+            self.logger.info("✓ Enriched and loaded %d orders", enriched)
 
             self.logger.info(
-                f"✅ Orders pipeline completed successfully for seller {seller_id}"
-            )
-            self.results.add_seller_result(
-                seller_id, "orders", True, len(enriched_orders)
+                "✅ Orders pipeline completed successfully for seller %s", seller_id
             )
+            self.results.add_seller_result(seller_id, "orders", True, enriched)
             return True
 
         except Exception as e:
             error_msg = f"Orders pipeline failed: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            self.logger.error("❌ %s", error_msg)
             self.results.add_seller_result(seller_id, "orders", False, 0, str(e))
             return False
 
     def run_full_pipeline(self, seller_id: str) -> Dict[str, bool]:
         """Execute both items and orders pipelines for a single seller."""
-        self.logger.info(f"🚀 Starting FULL pipeline for seller {seller_id}")
+        self.logger.info("🚀 Starting FULL pipeline for seller %s", seller_id)
 
         items_success = self.run_items_pipeline(seller_id)
         orders_success = self.run_orders_pipeline(seller_id)
@@ -434,23 +588,37 @@ class ImprovedETLPipeline:
             seller_ids = self.config.default_sellers
 
         self.logger.info(
-            f"🎯 Starting MULTI-SELLER pipeline for {len(seller_ids)} sellers"
+            "🎯 Starting MULTI-SELLER pipeline for %d sellers", len(seller_ids)
         )
 
-        for i, seller_id in enumerate(seller_ids, 1):
-            self.logger.info(f"📍 Processing seller {i}/{len(seller_ids)}: {seller_id}")
-            try:
-                self.run_full_pipeline(seller_id)
-            except Exception as e:
-                self.logger.error(f"❌ Critical failure for seller {seller_id}: {e}")
-                self.results.add_seller_result(
-                    seller_id, "items", False, 0, f"Critical failure: {e}"
-                )
-                self.results.add_seller_result(
-                    seller_id, "orders", False, 0, f"Critical failure: {e}"
+        # Sellers are independent and the work is I/O-bound (API calls, DB writes),
+        # so they run in a bounded thread pool to stay within API rate limits
+        max_workers = max(1, min(self.config.max_seller_workers, len(seller_ids)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.run_full_pipeline, seller_id): seller_id
+                for seller_id in seller_ids
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                seller_id = futures[future]
+                self.logger.info(
+                    "📍 Finished seller %d/%d: %s", done, len(seller_ids), seller_id
                 )
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(
+                        "❌ Critical failure for seller %s: %s", seller_id, e
+                    )
+                    self.results.add_seller_result(
+                        seller_id, "items", False, 0, f"Critical failure: {e}"
+                    )
+                    self.results.add_seller_result(
+                        seller_id, "orders", False, 0, f"Critical failure: {e}"
+                    )
 
-        return self.results.results
+        return self.results.by_seller()
 
     def generate_final_report(self):
         """Generate comprehensive final report."""
@@ -461,36 +629,37 @@ class ImprovedETLPipeline:
         self.logger.info("📊 PIPELINE EXECUTION REPORT")
         self.logger.info("=" * 60)
 
-        self.logger.info(f"⏱️  Total Duration: {summary['duration']:.2f} seconds")
-        self.logger.info(f"🏪 Total Sellers: {summary['total_sellers']}")
+        self.logger.info("⏱️  Total Duration: %.2f seconds", summary["duration"])
+        self.logger.info("🏪 Total Sellers: %d", summary["total_sellers"])
         self.logger.info(
-            f"📦 Items Successful: {summary['items_successful']}/{summary['total_sellers']}"
+            "📦 Items Successful: %d/%d",
+            summary["items_successful"],
+            summary["total_sellers"],
         )
         self.logger.info(
-            f"🛒 Orders Successful: {summary['orders_successful']}/{summary['total_sellers']}"
+            "🛒 Orders Successful: %d/%d",
+            summary["orders_successful"],
+            summary["total_sellers"],
         )
         self.logger.info(
-            f"✅ Fully Successful: {summary['fully_successful']}/{summary['total_sellers']}"
+            "✅ Fully Successful: %d/%d",
+            summary["fully_successful"],
+            summary["total_sellers"],
         )
 
         if summary["total_errors"] > 0:
-            self.logger.info(f"❌ Total Errors: {summary['total_errors']}")
+            self.logger.info("❌ Total Errors: %d", summary["total_errors"])
             for error in self.results.errors:
-                self.logger.error(f"   • {error}")
+                self.logger.error("   • %s", error)
 
         if summary["total_warnings"] > 0:
-            self.logger.info(f"⚠️  Total Warnings: {summary['total_warnings']}")
+            self.logger.info("⚠️  Total Warnings: %d", summary["total_warnings"])
             for warning in self.results.warnings:
-                self.logger.warning(f"   • {warning}")
+                self.logger.warning("   • %s", warning)
 
         # Save detailed results with organized path
-        self.results.save_to_file()  # Uses default organized path now
-
-        # Get the actual filepath for logging
-        results_dir = "logs/pipeline_results"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_file = f"pipeline_results_{timestamp}.json"
-        self.logger.info(f"📄 Detailed results saved to: {results_dir}/{results_file}")
+        results_path = self.results.save_to_file()  # Uses default organized path now
+        self.logger.info("📄 Detailed results saved to: %s", results_path)
 
         # Overall status
         if (
@@ -498,10 +667,17 @@ class ImprovedETLPipeline:
             and summary["total_errors"] == 0
         ):
             self.logger.info("🎉 PIPELINE EXECUTION: SUCCESS")
-            return True
+            success = True
         else:
             self.logger.info("💥 PIPELINE EXECUTION: PARTIAL SUCCESS OR FAILURE")
-            return False
+            success = False
+
+        # Release pooled DB connections and flush queued file log records
+        # before the process exits
+        if self._engine is not None:
+            self._engine.dispose()
+        self.logger_setup.close()
+        return success
 
     def save_current_config(self):
         """Save current pipeline configuration for future reference."""
@@ -511,17 +687,19 @@ class ImprovedETLPipeline:
         )
 
 
-def load_config_from_args() -> PipelineConfig:
+def load_config_from_args(
+    arg1: Optional[str] = None, is_config_path: bool = False
+) -> PipelineConfig:
     """Load configuration from command line arguments or config file."""
     config = PipelineConfig()
 
     # Check for config file argument
-    if len(sys.argv) > 1 and sys.argv[1].endswith(".json"):
+    if is_config_path:
         try:
-            config = PipelineConfig.load_from_file(sys.argv[1])
-            print(f"✓ Loaded configuration from {sys.argv[1]}")
+            config = PipelineConfig.load_from_file(arg1)
+            print(f"✓ Loaded configuration from {arg1}")
         except Exception as e:
-            print(f"⚠ Failed to load config file {sys.argv[1]}: {e}")
+            print(f"⚠ Failed to load config file {arg1}: {e}")
             print("Using default configuration...")
 
     return config
@@ -532,8 +710,18 @@ def main():
     print("🚀 Noneca.com Mercado Livre Analytics Pipeline")
     print("=" * 50)
 
+    # --bulk may appear anywhere; the rest are positional
+    args = [arg for arg in sys.argv[1:] if arg != "--bulk"]
+    bulk_load = len(args) != len(sys.argv) - 1
+
+    # Inspect the first argument once; it is either a config file or a seller ID
+    arg1 = args[0] if args else None
+    is_config_path = arg1 is not None and arg1.endswith(".json")
+
     # Load configuration
-    config = load_config_from_args()
+    config = load_config_from_args(arg1, is_config_path)
+    if bulk_load:
+        config.bulk_load = True
 
     # Initialize pipeline
     pipeline = ImprovedETLPipeline(config)
@@ -541,31 +729,34 @@ def main():
     # Validate environment
     if not pipeline.validate_environment():
         print("❌ Environment validation failed. Exiting.")
+        pipeline.logger_setup.close()
         sys.exit(1)
 
     # Parse command line arguments for specific operations
-    if len(sys.argv) > 1 and not sys.argv[1].endswith(".json"):
-        seller_id = sys.argv[1]
-        pipeline_type = sys.argv[2] if len(sys.argv) > 2 else "full"
+    if arg1 is not None and not is_config_path:
+        seller_id = arg1
+        pipeline_type = args[1] if len(args) > 1 else "full"
 
         pipeline.logger.info(
-            f"🎯 Running {pipeline_type.upper()} pipeline for seller: {seller_id}"
+            "🎯 Running %s pipeline for seller: %s", pipeline_type.upper(), seller_id
         )
 
-        if pipeline_type == "items":
-            success = pipeline.run_items_pipeline(seller_id)
-        elif pipeline_type == "orders":
-            success = pipeline.run_orders_pipeline(seller_id)
-        else:  # "full" or any other value
-            results = pipeline.run_full_pipeline(seller_id)
-            success = all(results.values())
+        with pipeline.bulk_load_context():
+            if pipeline_type == "items":
+                success = pipeline.run_items_pipeline(seller_id)
+            elif pipeline_type == "orders":
+                success = pipeline.run_orders_pipeline(seller_id)
+            else:  # "full" or any other value
+                results = pipeline.run_full_pipeline(seller_id)
+                success = all(results.values())
 
         pipeline.generate_final_report()
         sys.exit(0 if success else 1)
 
     # Multi-seller mode (default)
     pipeline.logger.info("🏪 Multi-seller mode: Processing all configured sellers")
-    pipeline.run_multi_seller_pipeline()
+    with pipeline.bulk_load_context():
+        pipeline.run_multi_seller_pipeline()
 
     # Generate final report and exit
     success = pipeline.generate_final_report()
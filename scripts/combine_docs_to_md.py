@@ -16,6 +16,15 @@ import os
 import argparse
 import sys
 
+# Ensure project root for imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.file_scan import walk_files
+
+# Chunk and buffer size for copying source files into the combined document
+COPY_CHUNK_SIZE = 1 << 20
+
 
 def find_md_files(root_dir, docs_subdir="docs", exclude_dir="archive"):
     """
@@ -32,17 +41,15 @@ def find_md_files(root_dir, docs_subdir="docs", exclude_dir="archive"):
     if not os.path.isdir(docs_dir):
         return files
 
-    for dirpath, dirnames, filenames in os.walk(docs_dir):
-        # skip excluded directory
-        # modify dirnames in-place to prevent os.walk from recursing into it
-        dirnames[:] = [d for d in dirnames if d != exclude_dir]
-        for name in filenames:
-            if not name.endswith(".md"):
-                continue
-            full = os.path.join(dirpath, name)
-            # compute relative path from project root
-            rel = os.path.relpath(full, start=root_dir)
-            files.append((full, rel))
+    # skip excluded directory while walking
+    suffix = ".md"
+    for entry in walk_files(docs_dir, skip=frozenset((exclude_dir,))):
+        if not entry.name.endswith(suffix):
+            continue
+        full = entry.path
+        # compute relative path from project root
+        rel = os.path.relpath(full, start=root_dir)
+        files.append((full, rel))
     return files
 
 
@@ -82,18 +89,37 @@ def select_files(files):
     return selected
 
 
+def _copy_rstripped(src, out, length=COPY_CHUNK_SIZE):
+    """
+    Copy `src` to `out` in fixed-size chunks, dropping trailing whitespace.
+    Whitespace at the end of a chunk is held back until non-whitespace follows.
+    """
+    pending = ""
+    while True:
+        chunk = src.read(length)
+        if not chunk:
+            break
+        stripped = chunk.rstrip()
+        if stripped:
+            out.write(pending)
+            out.write(stripped)
+            pending = chunk[len(stripped) :]
+        else:
+            pending += chunk
+
+
 def combine_to_md(selected, output_path, project_root):
     """
     Combine selected Markdown files into one, with headers.
     """
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as out:
+        with open(output_path, "w", encoding="utf-8", buffering=COPY_CHUNK_SIZE) as out:
             for full, rel in selected:
                 out.write(f"## File: {rel}\n\n")
                 with open(full, "r", encoding="utf-8") as f:
-                    out.write(f.read().rstrip())
-                    out.write("\n\n")
+                    _copy_rstripped(f, out)
+                out.write("\n\n")
         print(f"Combined Markdown saved to: {output_path}")
     except IOError as e:
         print(f"Error writing combined file: {e}")
@@ -13,6 +13,22 @@ Script: combine_py_to_md.py
 """
 import os
 import argparse
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# Ensure project root for imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.file_scan import append_file, check_line_count, walk_files
+
+# Threads used to check candidate files concurrently
+LINE_CHECK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Chunk and buffer size for copying source files into the combined document
+COPY_CHUNK_SIZE = 1 << 20
 
 
 def find_py_files(root, exclude_dirs=None, exclude_files=None):
@@ -27,22 +43,28 @@ def find_py_files(root, exclude_dirs=None, exclude_files=None):
     if exclude_files is None:
         exclude_files = {"combine_py_to_md.py"}
 
+    # Exclude specified directories from traversal
+    # Bind the filters to locals once; frozensets keep lookups O(1) even
+    # when callers pass lists
+    suffix = ".py"
+    skip_dirs = frozenset(exclude_dirs)
+    skip_files = frozenset(exclude_files)
+    candidates = []
+    for entry in walk_files(root, skip=skip_dirs):
+        name = entry.name
+        if name.endswith(suffix) and name not in skip_files:
+            candidates.append(entry.path)
+
+    # The line checks are independent file reads, so overlap them in threads;
+    # map() keeps results in walk order
     py_files = []
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Exclude specified directories from traversal
-        dirnames[:] = [d for d in dirnames if d not in exclude_dirs]
-
-        for name in filenames:
-            if not name.endswith(".py") or name in exclude_files:
-                continue
-            path = os.path.join(dirpath, name)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                if len(lines) > 5:
-                    py_files.append(path)
-            except (IOError, UnicodeDecodeError) as e:
-                print(f"Warning: could not read {path}: {e}")
+    with ThreadPoolExecutor(max_workers=LINE_CHECK_WORKERS) as executor:
+        checks = executor.map(check_line_count, candidates, repeat(5))
+        for path, (passed, error) in zip(candidates, checks):
+            if error is not None:
+                print(f"Warning: could not read {path}: {error}")
+            elif passed:
+                py_files.append(path)
     return py_files
 
 
@@ -86,13 +108,12 @@ def combine_to_md(selected_files, output):
       - Closes the code block with ```
     """
     try:
-        with open(output, "w", encoding="utf-8") as out:
+        with open(output, "w", encoding="utf-8", buffering=COPY_CHUNK_SIZE) as out:
             out.write("```python\n")
             for file in selected_files:
-                out.write(f"# --- {file}\n")
-                with open(file, "r", encoding="utf-8") as f:
-                    out.write(f.read())
-                    out.write("\n")
+                error = append_file(out, file, f"# --- {file}\n", "\n", COPY_CHUNK_SIZE)
+                if error is not None:
+                    print(f"Warning: could not read {file}: {error}")
             out.write("```")
         print(f"Successfully wrote combined file to: {output}")
     except IOError as e:
@@ -15,28 +15,50 @@ Usage:
 """
 import os
 import argparse
+import shutil
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
+# Ensure project root for imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scripts.file_scan import append_file, check_line_count, walk_files
+
+# Threads used to check candidate files concurrently
+LINE_CHECK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Chunk and buffer size for copying source files into the combined document
+COPY_CHUNK_SIZE = 1 << 20
 
 
 def find_py_files(test_dir, min_lines=5, exclude_files=None):
     if exclude_files is None:
         exclude_files = set()
 
+    # Bind the filters to locals once; a frozenset keeps lookups O(1) even
+    # when callers pass a list
+    suffix = ".py"
+    skip_files = frozenset(exclude_files)
+    candidates = []
+    for entry in walk_files(test_dir):
+        name = entry.name
+        if name.endswith(suffix) and name not in skip_files:
+            candidates.append(entry.path)
+
+    # The line checks are independent file reads, so overlap them in threads;
+    # map() keeps results in walk order
     py_files = []
-    for dirpath, _, filenames in os.walk(test_dir):
-        for name in filenames:
-            if not name.endswith(".py") or name in exclude_files:
-                continue
-            path = os.path.join(dirpath, name)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                if len(lines) > min_lines:
-                    rel_path = os.path.relpath(path, start=test_dir)
-                    py_files.append((path, rel_path))
-            except (IOError, UnicodeDecodeError) as e:
-                print(f"Warning: could not read {path}: {e}")
+    with ThreadPoolExecutor(max_workers=LINE_CHECK_WORKERS) as executor:
+        checks = executor.map(check_line_count, candidates, repeat(min_lines))
+        for path, (passed, error) in zip(candidates, checks):
+            if error is not None:
+                print(f"Warning: could not read {path}: {error}")
+            elif passed:
+                rel_path = os.path.relpath(path, start=test_dir)
+                py_files.append((path, rel_path))
     return py_files
 
 
@@ -70,13 +92,12 @@ def select_files(files):
 
 def combine_to_md(selected_files, output):
     try:
-        with open(output, "w", encoding="utf-8") as out:
+        with open(output, "w", encoding="utf-8", buffering=COPY_CHUNK_SIZE) as out:
             out.write("```python\n")
             for full, rel in selected_files:
-                out.write(f"# --- {rel}\n")
-                with open(full, "r", encoding="utf-8") as f:
-                    out.write(f.read())
-                    out.write("\n")
+                error = append_file(out, full, f"# --- {rel}\n", "\n", COPY_CHUNK_SIZE)
+                if error is not None:
+                    print(f"Warning: could not read {full}: {error}")
             out.write("```\n")
         print(f"Initial Markdown created at: {output}")
     except IOError as e:
@@ -95,13 +116,11 @@ def run_tests_and_append(initial_md, test_script, final_md, cwd):
         output = f"Error running tests: {e}\n"
 
     try:
-        with open(initial_md, "r", encoding="utf-8") as f:
-            content = f.read()
-        with open(final_md, "w", encoding="utf-8") as out:
-            out.write(content)
-            out.write("\n\n# Test Results\n```\n")
-            out.write(output)
-            out.write("```\n")
+        with open(initial_md, "r", encoding="utf-8") as f, open(
+            final_md, "w", encoding="utf-8", buffering=COPY_CHUNK_SIZE
+        ) as out:
+            shutil.copyfileobj(f, out, COPY_CHUNK_SIZE)
+            out.write("".join(("\n\n# Test Results\n```\n", output, "```\n")))
         print(f"Final Markdown with results saved at: {final_md}")
     except IOError as e:
         print(f"Error writing final markdown: {e}")
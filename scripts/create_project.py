@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 PROJECT_ROOT = "noneca_com_main_v2"
 
@@ -57,35 +58,42 @@ module_dirs = [
 ]
 
 
-def create_file(path, content):
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content + "\n")
+def create_file(path, content, mode="w"):
+    try:
+        with open(path, mode, encoding="utf-8") as f:
+            f.write(content + "\n")
+    except FileExistsError:
+        pass  # mode "x": keep the existing file
 
 
 def build_project():
     os.makedirs(PROJECT_ROOT, exist_ok=True)
     os.chdir(PROJECT_ROOT)
 
-    # Create folders and __init__.py files
-    for module_dir in module_dirs:
-        os.makedirs(module_dir, exist_ok=True)
-        init_path = os.path.join(module_dir, "__init__.py")
-        if not os.path.exists(init_path):
-            create_file(
-                init_path, f'# __init__.py\n"""Initialize {module_dir} module."""'
-            )
+    # Create every folder once up front (module dirs, file parents, data/)
+    dirs = set(module_dirs) | {os.path.dirname(p) for p in files} | {"data"}
+    dirs.discard("")
+    for dir_name in sorted(dirs):
+        os.makedirs(dir_name, exist_ok=True)
 
-    # Create files with headers
-    for file_path, header in files.items():
-        full_path = os.path.join(PROJECT_ROOT, file_path)
-        dir_name = os.path.dirname(full_path)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name, exist_ok=True)
-        create_file(file_path, header)
+    # __init__.py files are opened exclusively so existing ones are kept
+    # without a separate exists() check; headers and data/.gitkeep overwrite
+    to_create = [
+        (
+            os.path.join(module_dir, "__init__.py"),
+            f'# __init__.py\n"""Initialize {module_dir} module."""',
+            "x",
+        )
+        for module_dir in module_dirs
+    ]
+    to_create.extend((path, header, "w") for path, header in files.items())
+    to_create.append(
+        ("data/.gitkeep", '# .gitkeep\n"""Ensure data folder is versioned."""', "w")
+    )
 
-    # Create data/ folder and .gitkeep inside it
-    os.makedirs("data", exist_ok=True)
-    create_file("data/.gitkeep", '# .gitkeep\n"""Ensure data folder is versioned."""')
+    # The files are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(lambda item: create_file(*item), to_create))
 
     print("✅ Project skeleton created successfully.")
 
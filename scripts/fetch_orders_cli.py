@@ -6,6 +6,8 @@ and save results to uniquely named JSON files under separate fetch-type folders.
 
 Features:
 1. Always saves output with a unique filename into data/orders/json_raw/{fetch_type}
+   (an indented {"orders": [...]} JSON document, written as pages arrive;
+   pass --jsonl for compact gzipped JSON Lines, one order per line)
 2. Prints to terminal:
    - Basic operations log
    - File header (first order) and footer (last order)
@@ -20,25 +22,36 @@ Interface:
   4. Last 100 orders, newest → oldest
 """
 
+import gzip
 import json
 import os
 import sys
 import uuid
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-import pytz
+from zoneinfo import ZoneInfo
 
 # Ensure project root for imports
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, PROJECT_ROOT)
 
-from src.extractors.ml_api_client import create_client
+from src.extractors.ml_api_client import bounded_map, create_client
 
 # MercadoLibre /orders/search max limit per request
 MAX_API_LIMIT = 50
 
+# Page requests kept in flight once the total is known
+MAX_CONCURRENT_PAGES = 8
 
-def fetch_orders(
+# Output base, resolved once instead of on every save
+_ORDERS_RAW_DIR = (
+    Path(__file__).resolve().parent.parent / "data" / "orders" / "json_raw"
+)
+
+
+def iter_order_pages(
     seller_id,
     total_count=None,
     page_size=MAX_API_LIMIT,
@@ -47,37 +60,17 @@ def fetch_orders(
     sort="date_asc",
 ):
     """
-    Fetch orders via /orders/search with pagination.
+    Yield orders from /orders/search one page (list of dicts) at a time,
+    in offset order, so callers can persist them as they arrive.
 
-    Args:
-        seller_id (str): seller ID
-        total_count (int|None): number of orders to fetch; None means fetch all until empty
-        page_size (int): batch size per API request
-        date_from (str): ISO date from
-        date_to (str): ISO date to
-        sort (str): 'date_asc' or 'date_desc'
-    Returns:
-        list: list of order dicts
+    Takes the same arguments as fetch_orders.
     """
     if page_size > MAX_API_LIMIT:
         page_size = MAX_API_LIMIT
 
     client, token = create_client()
-    client._auth(token)
-
-    collected = []
-    offset = 0
-
-    while True:
-        # If total_count set, stop when reached
-        if total_count is not None and len(collected) >= total_count:
-            break
-        limit = (
-            page_size
-            if total_count is None
-            else min(page_size, total_count - len(collected))
-        )
 
+    def fetch_page(offset, limit):
         params = {
             "seller": seller_id,
             "limit": limit,
@@ -86,84 +79,185 @@ def fetch_orders(
             "order.date_created.from": date_from,
             "order.date_created.to": date_to,
         }
-        resp = client._req("GET", "/orders/search", params=params)
-        batch = resp.get("results", [])
-        if not batch:
-            break
+        return client._req("GET", "/orders/search", params=params)
+
+    # First page tells us how many orders exist
+    first_limit = page_size if total_count is None else min(page_size, total_count)
+    if first_limit <= 0:
+        return
+    resp = fetch_page(0, first_limit)
+    batch = resp.get("results", [])
+    if batch:
+        yield batch
+    if len(batch) < first_limit:
+        return
+    fetched = len(batch)
+
+    available = resp.get("paging", {}).get("total")
+    if available is None:
+        # No total to plan against: keep paging until a short/empty page
+        while total_count is None or fetched < total_count:
+            limit = (
+                page_size
+                if total_count is None
+                else min(page_size, total_count - fetched)
+            )
+            batch = fetch_page(fetched, limit).get("results", [])[:limit]
+            if batch:
+                yield batch
+            fetched += len(batch)
+            if len(batch) < limit:
+                break
+        return
+
+    target = available if total_count is None else min(total_count, available)
+
+    # Remaining pages are independent offsets; fetch them concurrently and
+    # hand them back in offset order, with only `workers` pages in flight so
+    # memory tracks the worker count rather than the result-set size
+    pages = [
+        (offset, min(page_size, target - offset))
+        for offset in range(fetched, target, page_size)
+    ]
+    if pages:
+        workers = min(MAX_CONCURRENT_PAGES, len(pages))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            responses = bounded_map(
+                executor, lambda page: fetch_page(*page), pages, workers
+            )
+            for (_, limit), page_resp in zip(pages, responses):
+                batch = page_resp.get("results", [])[:limit]
+                if batch:
+                    yield batch
+                # a short page means the data ran out early
+                if len(batch) < limit:
+                    break
 
-        collected.extend(batch)
-        offset += len(batch)
 
-        # if fewer returned than requested, no more data
-        if len(batch) < limit:
-            break
+def fetch_orders(
+    seller_id,
+    total_count=None,
+    page_size=MAX_API_LIMIT,
+    date_from=None,
+    date_to=None,
+    sort="date_asc",
+):
+    """
+    Fetch orders via /orders/search with pagination.
 
-    return collected if total_count is None else collected[:total_count]
+    Args:
+        seller_id (str): seller ID
+        total_count (int|None): number of orders to fetch; None means fetch all until empty
+        page_size (int): batch size per API request
+        date_from (str): ISO date from
+        date_to (str): ISO date to
+        sort (str): 'date_asc' or 'date_desc'
+    Returns:
+        list: list of order dicts
+    """
+    pages = iter_order_pages(
+        seller_id, total_count, page_size, date_from, date_to, sort
+    )
+    if total_count is None:
+        collected = []
+        for batch in pages:
+            collected.extend(batch)
+        return collected
+
+    # The size is bounded up front: allocate once, fill pages in place by
+    # position, then trim whatever the seller didn't have
+    collected = [None] * total_count
+    filled = 0
+    for batch in pages:
+        collected[filled : filled + len(batch)] = batch
+        filled += len(batch)
+    del collected[filled:]
+    return collected
 
 
 def default_date_range(months=12):
-    tz = pytz.timezone("America/Sao_Paulo")
+    tz = ZoneInfo("America/Sao_Paulo")
     now = datetime.now(tz)
     past = now - timedelta(days=30 * months)
     fmt = "%Y-%m-%dT%H:%M:%S.000-03:00"
     return past.strftime(fmt), now.strftime(fmt)
 
 
-def save_orders(orders, seller_id, fetch_type):
+def save_orders(orders, seller_id, fetch_type, jsonl=False):
     """
-    Save orders to a JSON file with unique name under:
+    Stream orders to a file with unique name under:
     ./data/orders/json_raw/{fetch_type}/
 
+    By default an indented {"orders": [...]} document (.json) is written,
+    the format enrich_orders_from_json reads. With jsonl=True each order is
+    written as one compact JSON line to a gzipped JSON Lines file
+    (.jsonl.gz) instead, which is much smaller for large fetches.
+
     Args:
-        orders (list): list of order dicts
+        orders (iterable): order dicts; consumed once, never held in full
         seller_id (str): seller ID
         fetch_type (str): one of 'last500', 'last5000', 'all', 'last100'
+        jsonl (bool): write gzipped JSON Lines instead of a JSON document
 
     Returns:
-        str: path to saved file
+        tuple: (path to saved file, number of orders, first order, last order)
     """
     # Build directory relative to project root
-    data_dir = (
-        Path(__file__).resolve().parent.parent
-        / "data"
-        / "orders"
-        / "json_raw"
-        / fetch_type
-    )
+    data_dir = _ORDERS_RAW_DIR / fetch_type
     data_dir.mkdir(parents=True, exist_ok=True)
 
     # Create a unique filename
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
     unique_id = uuid.uuid4().hex[:8]
-    filename = f"orders_{seller_id}_{timestamp}_{unique_id}.json"
+    extension = "jsonl.gz" if jsonl else "json"
+    filename = f"orders_{seller_id}_{timestamp}_{unique_id}.{extension}"
 
     # Full file path
     filepath = data_dir / filename
 
-    # Write JSON
-    with filepath.open("w") as f:
-        json.dump({"orders": orders}, f, indent=2)
-
-    return str(filepath)
-
-
-def print_summary(orders, filename):
-    count = len(orders)
+    # Only the first and last orders are kept for the terminal summary
+    count, first, last = 0, None, None
+    with filepath.open("wb", buffering=1 << 20) as raw:
+        if jsonl:
+            # gzip level 1 is fast and still roughly halves the size
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1) as f:
+                for order in orders:
+                    f.write(orjson.dumps(order, option=orjson.OPT_APPEND_NEWLINE))
+                    if not count:
+                        first = order
+                    last = order
+                    count += 1
+        else:
+            raw.write(b'{\n  "orders": [')
+            for order in orders:
+                raw.write(b",\n    " if count else b"\n    ")
+                encoded = orjson.dumps(order, option=orjson.OPT_INDENT_2)
+                raw.write(encoded.replace(b"\n", b"\n    "))
+                if not count:
+                    first = order
+                last = order
+                count += 1
+            raw.write(b"\n  ]\n}" if count else b"]\n}")
+
+    return str(filepath), count, first, last
+
+
+def print_summary(filename, count, first, last):
     if count == 0:
         print("No orders fetched.")
         return
 
-    first = orders[0]["date_created"]
-    last = orders[-1]["date_created"]
-
     print(f"\nSaved {count} orders to {filename}")
-    print(f"Date range in file: {first} → {last}")
-    print("Sample record (first):", json.dumps(orders[0], indent=2))
+    print(f"Date range in file: {first['date_created']} → {last['date_created']}")
+    print("Sample record (first):", json.dumps(first, indent=2))
     if count > 1:
-        print("Sample record (last):", json.dumps(orders[-1], indent=2))
+        print("Sample record (last):", json.dumps(last, indent=2))
 
 
 def main():
+    # Compact gzipped JSON Lines for large fetches; default is a JSON document
+    jsonl = "--jsonl" in sys.argv[1:]
+
     seller = input("Enter seller ID [354140329]: ").strip() or "354140329"
 
     print("\nSelect retrieval option:")
@@ -188,7 +282,7 @@ def main():
         sys.exit(1)
 
     total_count, sort_order, fetch_type = fetch_type_map[choice]
-    orders = fetch_orders(
+    pages = iter_order_pages(
         seller,
         total_count=total_count,
         page_size=MAX_API_LIMIT,
@@ -197,8 +291,10 @@ def main():
         sort=sort_order,
     )
 
-    fname = save_orders(orders, seller, fetch_type)
-    print_summary(orders, fname)
+    # Orders are written page by page as they arrive instead of being
+    # collected into one list first
+    orders = (order for batch in pages for order in batch)
+    print_summary(*save_orders(orders, seller, fetch_type, jsonl=jsonl))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Module: file_scan.py
+
+Directory walking, line-count and file-copy helpers shared by the
+combine_*_to_md.py scripts.
+"""
+import os
+import shutil
+
+
+def walk_files(root, skip=()):
+    """
+    Yield os.DirEntry objects for files under `root`, top-down like os.walk,
+    without descending into directories named in `skip`. Directories that
+    cannot be listed are skipped silently, as os.walk does by default.
+    """
+    subdirs = []
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            # DirEntry caches the file type from the directory listing,
+            # so these checks don't cost an extra stat() per entry
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+    for path in subdirs:
+        yield from walk_files(path, skip)
+
+
+def has_more_than_n_lines(path, n):
+    """Return True once line n + 1 is read, without reading the rest of the file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for count, _ in enumerate(f, start=1):
+            if count > n:
+                return True
+    return False
+
+
+def check_line_count(path, n):
+    """Run the line-count check for a worker thread, returning (passed, error)."""
+    try:
+        return has_more_than_n_lines(path, n), None
+    except (IOError, UnicodeDecodeError) as e:
+        return False, e
+
+
+def append_file(out, path, header="", footer="", chunk_size=1 << 20):
+    """
+    Write `header`, the UTF-8 text of `path` and `footer` to the text stream
+    `out`. The line-count check may stop before a decoding error further into
+    the file, so if `path` cannot be opened or decoded, everything written for
+    it is rolled back and the error is returned instead; None on success.
+    """
+    start = out.tell()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            out.write(header)
+            shutil.copyfileobj(f, out, chunk_size)
+    except (OSError, UnicodeDecodeError) as e:
+        out.seek(start)
+        out.truncate()
+        return e
+    out.write(footer)
+    return None
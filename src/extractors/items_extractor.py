@@ -2,19 +2,73 @@
 # src/extractors/items_extractor.py
 """Extractor for fetching product catalog data with pagination support."""
 import logging
-from typing import List, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
 from src.extractors.ml_api_client import create_client
 
 logger = logging.getLogger(__name__)
 
+# The raw item fields product_enricher.enrich_item reads. Callers that only
+# enrich the items can pass this as `attrs` so the wide item payloads
+# (pictures, shipping, variations, ...) are never decoded and held in memory.
+RAW_ITEM_FIELDS = ",".join(
+    (
+        "id",
+        "title",
+        "category_id",
+        "price",
+        "original_price",
+        "available_quantity",
+        "sold_quantity",
+        "condition",
+        "attributes",
+        "views",
+        "seller_id",
+        "seller",
+    )
+)
+
+# Shared (client, token, created_at) so back-to-back extractions reuse one
+# session and token instead of re-reading/refreshing tokens each call.
+# get_token() only hands out tokens valid for 5+ more minutes, so the
+# cached pair is renewed after that window.
+CLIENT_TTL_SECONDS = 300.0
+_client_cache: Optional[Tuple] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> Tuple:
+    """Return the shared (client, token), creating it on first use or expiry."""
+    global _client_cache
+    with _client_lock:
+        now = time.monotonic()
+        if _client_cache is None or now - _client_cache[2] > CLIENT_TTL_SECONDS:
+            client, token = create_client()
+            _client_cache = (client, token, now)
+        return _client_cache[0], _client_cache[1]
+
+
+def reset_client() -> None:
+    """Drop the shared client so the next call creates a fresh one."""
+    global _client_cache
+    with _client_lock:
+        _client_cache = None
 
-def extract_items(seller_id: str, limit: Optional[int] = None) -> List[Dict]:
+
+def extract_items(
+    seller_id: str, limit: Optional[int] = None, attrs: Optional[str] = None
+) -> List[Dict]:
     """
     Extract items for a given seller using the ML API client with pagination.
 
     Args:
         seller_id: The seller ID to extract items for
         limit: Maximum number of items to extract (None for all items, default: None)
+        attrs: Comma-separated item fields to fetch, e.g. RAW_ITEM_FIELDS
+            (None for the full item payload)
 
     Returns:
         List of item dictionaries, or empty list if extraction fails
@@ -27,29 +81,66 @@ def extract_items(seller_id: str, limit: Optional[int] = None) -> List[Dict]:
         logger.error("Limit must be positive or None")
         return []
 
+    # Log the extraction attempt
+    if limit is None:
+        logger.info("Starting extraction of ALL items for seller %s", seller_id)
+    else:
+        logger.info(
+            "Starting extraction of up to %d items for seller %s", limit, seller_id
+        )
+
+    # Only the API calls are guarded; MLClient reports every failure as a
+    # plain Exception, so that is what has to be caught here
     try:
-        client, token = create_client()
+        client, token = _get_client()
+        items = client.get_items(token, seller_id, limit=limit, attrs=attrs)
+    except Exception as e:
+        logger.error("Failed to extract items for seller %s: %s", seller_id, e)
+        return []
 
-        # Log the extraction attempt
-        if limit is None:
-            logger.info(f"Starting extraction of ALL items for seller {seller_id}")
-        else:
-            logger.info(
-                f"Starting extraction of up to {limit} items for seller {seller_id}"
-            )
+    if not items:
+        logger.info("No items found for seller %s", seller_id)
+        return []
 
-        items = client.get_items(token, seller_id, limit=limit)
+    logger.info("Successfully extracted %d items for seller %s", len(items), seller_id)
+    return items
 
-        if not items:
-            logger.info(f"No items found for seller {seller_id}")
-            return []
 
-        logger.info(f"Successfully extracted {len(items)} items for seller {seller_id}")
-        return items
+def extract_items_iter(
+    seller_id: str, limit: Optional[int] = None, attrs: Optional[str] = None
+) -> Iterator[List[Dict]]:
+    """
+    Stream a seller's items page by page instead of returning one list.
+
+    Args:
+        seller_id: The seller ID to extract items for
+        limit: Maximum number of items to extract (None for all items, default: None)
+        attrs: Comma-separated item fields to fetch (None for the full payload)
+
+    Yields:
+        Lists of item dictionaries, one per API page; stops early if extraction fails
+    """
+    if not seller_id:
+        logger.error("Seller ID is required")
+        return
+
+    if limit is not None and limit <= 0:
+        logger.error("Limit must be positive or None")
+        return
+
+    extracted = 0
+    try:
+        client, token = _get_client()
+        logger.info("Starting streamed extraction of items for seller %s", seller_id)
+
+        for page in client.iter_item_pages(token, seller_id, limit=limit, attrs=attrs):
+            extracted += len(page)
+            yield page
 
     except Exception as e:
-        logger.error(f"Failed to extract items for seller {seller_id}: {e}")
-        return []
+        logger.error("Failed to extract items for seller %s: %s", seller_id, e)
+
+    logger.info("Streamed %d items for seller %s", extracted, seller_id)
 
 
 def extract_item_details(item_id: str, token: Optional[str] = None) -> Optional[Dict]:
@@ -69,22 +160,59 @@ def extract_item_details(item_id: str, token: Optional[str] = None) -> Optional[
 
     try:
         if token is None:
-            client, token = create_client()
+            client, token = _get_client()
         else:
-            client = create_client()[0]
+            # Use the caller's token with the shared client
+            client = _get_client()[0]
 
         item_details = client.get_item(token, item_id)
+    except Exception as e:
+        logger.error("Failed to extract details for item %s: %s", item_id, e)
+        return None
+
+    if item_details:
+        logger.info("Successfully extracted details for item %s", item_id)
+        return item_details
+
+    logger.warning("No details found for item %s", item_id)
+    return None
 
-        if item_details:
-            logger.info(f"Successfully extracted details for item {item_id}")
-            return item_details
-        else:
-            logger.warning(f"No details found for item {item_id}")
-            return None
+
+def _enrich_one(
+    item: Dict,
+    client,
+    token: str,
+    include_descriptions: bool,
+    include_reviews: bool,
+    copy: bool = False,
+) -> Dict:
+    """
+    Fetch the requested extras for one item; failures are logged, not raised.
+
+    The extras are written onto `item` itself unless `copy` is set.
+    """
+    item_id = item.get("id")
+    if not item_id:
+        return item
+
+    enriched_item = item.copy() if copy else item
+
+    try:
+        # Add description if requested
+        if include_descriptions:
+            description = client.get_desc(token, item_id)
+            enriched_item["description"] = description.get("plain_text", "N/A")
+
+        # Add reviews if requested
+        if include_reviews:
+            reviews = client.get_reviews(token, item_id)
+            enriched_item["rating_average"] = reviews.get("rating_average", 0)
+            enriched_item["total_reviews"] = reviews.get("total_reviews", 0)
 
     except Exception as e:
-        logger.error(f"Failed to extract details for item {item_id}: {e}")
-        return None
+        logger.warning("Failed to enrich item %s: %s", item_id, e)
+
+    return enriched_item
 
 
 def extract_items_with_enrichments(
@@ -92,6 +220,9 @@ def extract_items_with_enrichments(
     limit: Optional[int] = None,
     include_descriptions: bool = True,
     include_reviews: bool = False,
+    max_workers: int = 16,
+    copy: bool = False,
+    attrs: Optional[str] = None,
 ) -> List[Dict]:
     """
     Extract items with additional details like descriptions and optionally reviews.
@@ -101,58 +232,108 @@ def extract_items_with_enrichments(
         limit: Maximum number of items to extract (None for all items)
         include_descriptions: Whether to include item descriptions
         include_reviews: Whether to include review data
+        max_workers: Number of items enriched concurrently (API-bound)
+        copy: Enrich shallow copies instead of the freshly fetched item dicts
+        attrs: Comma-separated item fields to fetch (None for the full payload)
 
     Returns:
         List of enriched item dictionaries
     """
+    # Nothing to add: skip the thread pool and per-item pass entirely
+    if not (include_descriptions or include_reviews):
+        return extract_items(seller_id, limit, attrs)
+
     if not seller_id:
         logger.error("Seller ID is required")
         return []
 
-    try:
-        client, token = create_client()
-        items = extract_items(seller_id, limit)
+    if limit is not None and limit <= 0:
+        logger.error("Limit must be positive or None")
+        return []
 
-        if not items:
-            return []
+    try:
+        # Fetch with the client already in hand rather than via extract_items
+        client, token = _get_client()
+        items = client.get_items(token, seller_id, limit=limit, attrs=attrs)
+    except Exception as e:
+        logger.error("Failed to extract enriched items for seller %s: %s", seller_id, e)
+        return []
 
-        logger.info(f"Starting enrichment of {len(items)} items for seller {seller_id}")
-        enriched_items = []
+    if not items:
+        logger.info("No items found for seller %s", seller_id)
+        return []
 
-        for i, item in enumerate(items, 1):
-            item_id = item.get("id")
-            if not item_id:
-                enriched_items.append(item)
-                continue
+    total = len(items)
+    progress_step = max(1, total // 10)
+    logger.info("Starting enrichment of %d items for seller %s", total, seller_id)
+    enriched_items = []
+
+    # Each item costs one or two blocking HTTP calls, so they run in a
+    # thread pool; map() keeps the original item order. _enrich_one handles
+    # its own API failures, so nothing here needs a handler.
+    enrich = partial(
+        _enrich_one,
+        client=client,
+        token=token,
+        include_descriptions=include_descriptions,
+        include_reviews=include_reviews,
+        copy=copy,
+    )
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for i, enriched_item in enumerate(executor.map(enrich, items), 1):
+            enriched_items.append(enriched_item)
 
-            enriched_item = item.copy()
+            # Log progress at 1, 2, 4, 8, ... items, then every 10% of the total
+            if i & (i - 1) == 0 or i % progress_step == 0:
+                logger.info("Enriched %d/%d items for seller %s", i, total, seller_id)
 
-            try:
-                # Add description if requested
-                if include_descriptions:
-                    description = client.get_desc(token, item_id)
-                    enriched_item["description"] = description.get("plain_text", "N/A")
+    logger.info(
+        "Successfully enriched %d items for seller %s", len(enriched_items), seller_id
+    )
+    return enriched_items
 
-                # Add reviews if requested
-                if include_reviews:
-                    reviews = client.get_reviews(token, item_id)
-                    enriched_item["rating_average"] = reviews.get("rating_average", 0)
-                    enriched_item["total_reviews"] = reviews.get("total_reviews", 0)
 
-            except Exception as e:
-                logger.warning(f"Failed to enrich item {item_id}: {e}")
+def iter_items_with_enrichments(
+    seller_id: str,
+    limit: Optional[int] = None,
+    include_descriptions: bool = True,
+    include_reviews: bool = False,
+    max_workers: int = 16,
+    copy: bool = False,
+    attrs: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Streaming variant of extract_items_with_enrichments: each page of items
+    is enriched and yielded while the next page has not been fetched yet.
 
-            enriched_items.append(enriched_item)
+    Takes the same arguments as extract_items_with_enrichments.
 
-            # Log progress every 25 items
-            if i % 25 == 0:
-                logger.info(f"Enriched {i}/{len(items)} items for seller {seller_id}")
+    Yields:
+        Enriched item dictionaries, in extraction order
+    """
+    if not (include_descriptions or include_reviews):
+        for page in extract_items_iter(seller_id, limit, attrs):
+            yield from page
+        return
 
-        logger.info(
-            f"Successfully enriched {len(enriched_items)} items for seller {seller_id}"
-        )
-        return enriched_items
+    if not seller_id:
+        logger.error("Seller ID is required")
+        return
 
+    try:
+        client, token = _get_client()
     except Exception as e:
-        logger.error(f"Failed to extract enriched items for seller {seller_id}: {e}")
-        return []
+        logger.error("Failed to extract enriched items for seller %s: %s", seller_id, e)
+        return
+
+    enrich = partial(
+        _enrich_one,
+        client=client,
+        token=token,
+        include_descriptions=include_descriptions,
+        include_reviews=include_reviews,
+        copy=copy,
+    )
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for page in extract_items_iter(seller_id, limit, attrs):
+            yield from executor.map(enrich, page)
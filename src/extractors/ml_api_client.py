@@ -2,47 +2,135 @@
 # src/extractors/ml_api_client.py
 """Mercado Livre API client with OAuth 2.0 integration and pagination support."""
 import os
-import json
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import typing
 from typing import Dict, Any, Optional
-import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
-from config.config import cfg
+from config.config import cfg, fallback_access, fallback_refresh, fallback_expires
+
+# Keep-alive connections kept per host; sized for concurrent page fetches that
+# each run their own multi-get workers
+POOL_MAXSIZE = 64
+
+# Upper bound on ids per /items?ids= multi-get request
+MULTIGET_MAX_IDS = 20
+
+# Concurrent requests per multi-get batch (chunks, or per-item fallbacks)
+MULTIGET_WORKERS = 8
+
+# Item search pages fetched in parallel once the catalog size is known
+MAX_CONCURRENT_PAGES = 8
+
+# How long site/category reference data is reused before being fetched again
+METADATA_TTL_SECONDS = 3600
+
+# Reference-data responses kept per client; least recently used go first
+METADATA_CACHE_MAXSIZE = 1024
+
+# Transient failures retried by the adapter before _req sees an error.
+# Only idempotent methods are retried, and Retry-After is honoured on 429/503;
+# connection failures (DNS, refused) get fewer attempts than gateway errors.
+# A plain 500 is usually a real server-side error, so it is not retried.
+RETRY_POLICY = Retry(
+    total=3,
+    connect=2,
+    backoff_factor=0.3,
+    status_forcelist=(429, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def bounded_map(executor, fn, items, window):
+    """
+    Like executor.map(fn, items), but with at most `window` calls submitted
+    ahead of the consumer: the next call is submitted as each result is
+    handed out, so finished results never pile up while the caller is busy.
+    Results are yielded in input order.
+    """
+    items = iter(items)
+    pending = deque(executor.submit(fn, item) for item in islice(items, window))
+    while pending:
+        result = pending.popleft().result()
+        for item in islice(items, 1):
+            pending.append(executor.submit(fn, item))
+        yield result
+
+
+class MLHTTPError(Exception):
+    """An HTTP error response from the API, with its status code and body."""
+
+    def __init__(self, message, status, payload=None):
+        super().__init__(message)
+        self.status = status
+        self.payload = payload
 
 
 class MLClient:
     def __init__(self):
         self.session = requests.Session()
+        # One pooled adapter so threads sharing this client reuse TCP/TLS
+        # connections instead of discarding them past the default 10
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=POOL_MAXSIZE,
+                max_retries=RETRY_POLICY,
+            ),
+        )
         self.session.headers.update(
             {"Accept": "application/json", "User-Agent": "MLExtractor/1.0"}
         )
-        self._rate = {"calls": 0, "reset": datetime.now()}
+        # Fixed one-minute window on the monotonic clock; shared by threads
+        self._rate_calls = 0
+        self._rate_reset = time.monotonic()
+        self._rate_lock = threading.Lock()
+        self._token = None
+        # endpoint -> (fetched_at, encoded response) for near-static reference
+        # data, in least- to most-recently-used order
+        self._metadata_cache = OrderedDict()
+        self._metadata_lock = threading.Lock()
 
     def _check_rate(self):
-        now = datetime.now()
-        if now - self._rate["reset"] > timedelta(minutes=1):
-            self._rate = {"calls": 0, "reset": now}
-        if self._rate["calls"] >= cfg.rate_limit:
-            raise Exception("Rate limit exceeded")
-        self._rate["calls"] += 1
+        """Count one call, waiting for the next window once the budget is spent."""
+        with self._rate_lock:
+            now = time.monotonic()
+            if now - self._rate_reset > 60.0:
+                self._rate_calls = 0
+                self._rate_reset = now
+            if self._rate_calls >= cfg.rate_limit:
+                # Sleeping under the lock holds the other threads back too, so
+                # concurrent callers queue for the window instead of failing
+                time.sleep(max(0.0, 60.0 - (now - self._rate_reset)))
+                self._rate_calls = 0
+                self._rate_reset = time.monotonic()
+            self._rate_calls += 1
 
     def _req(self, method, endpoint, **kwargs):
         self._check_rate()
         url = f"{cfg.api_url}{endpoint}"
 
-        kwargs.setdefault("headers", {}).update(
-            {"X-Request-ID": secrets.token_hex(8), "Cache-Control": "no-cache"}
-        )
-
         try:
             resp = self.session.request(method, url, timeout=cfg.timeout, **kwargs)
             resp.raise_for_status()
-            return {} if resp.status_code == 204 else resp.json()
+            # 204s and other empty bodies have nothing to decode; orjson
+            # parses the raw bytes directly, skipping charset detection
+            if resp.status_code == 204 or not resp.content:
+                return {}
+            return orjson.loads(resp.content)
         except requests.exceptions.HTTPError:
             status = resp.status_code
             try:
-                err = resp.json()
+                err = orjson.loads(resp.content)
             except ValueError:
                 err = {"error": "Invalid JSON"}
 
@@ -52,14 +140,45 @@ class MLClient:
                 404: f"Not found: {endpoint}",
                 429: "Rate limited",
             }
-            raise Exception(error_map.get(status, f"HTTP {status}: {err}"))
+            raise MLHTTPError(
+                error_map.get(status, f"HTTP {status}: {err}"), status, err
+            )
         except requests.exceptions.Timeout:
             raise Exception("Request timeout")
         except Exception as e:
             raise Exception(f"Request failed: {str(e)}")
 
+    def _get_metadata(self, endpoint):
+        """
+        GET reference data, reusing a response for METADATA_TTL_SECONDS.
+
+        Responses are cached as encoded JSON and decoded on every hit, so each
+        caller gets its own copy and mutating it cannot corrupt the cache.
+        """
+        now = time.monotonic()
+        with self._metadata_lock:
+            cached = self._metadata_cache.get(endpoint)
+            if cached and now - cached[0] < METADATA_TTL_SECONDS:
+                self._metadata_cache.move_to_end(endpoint)
+                return orjson.loads(cached[1])
+        data = self._req("GET", endpoint)
+        with self._metadata_lock:
+            self._metadata_cache[endpoint] = (now, orjson.dumps(data))
+            self._metadata_cache.move_to_end(endpoint)
+            if len(self._metadata_cache) > METADATA_CACHE_MAXSIZE:
+                self._metadata_cache.popitem(last=False)
+        return data
+
+    def set_token(self, token):
+        """Set the bearer token sent with every request on this session."""
+        self.session.headers["Authorization"] = f"Bearer {token}"
+        self._token = token
+
     def _auth(self, token):
-        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        # The token rarely changes mid-crawl, so the shared session headers
+        # are only written when it does, not on every API call
+        if token != self._token:
+            self.set_token(token)
 
     # Core API methods
     def get_user(self, token, user_id="me", attrs=None):
@@ -67,7 +186,7 @@ class MLClient:
         params = {"attributes": attrs} if attrs else {}
         return self._req("GET", f"/users/{user_id}", params=params)
 
-    def get_items(self, token, seller_id, limit=None, status="active"):
+    def get_items(self, token, seller_id, limit=None, status="active", attrs=None):
         """
         Extract items for a seller with pagination support.
 
@@ -76,66 +195,214 @@ class MLClient:
             seller_id: The seller ID to extract items for
             limit: Maximum number of items to extract (None for all items)
             status: Item status filter (default: "active")
+            attrs: Comma-separated item fields to return (None for all fields)
 
         Returns:
             List of item dictionaries with full details
         """
-        self._auth(token)
-
         collected_items = []
-        offset = 0
-        page_size = 100  # Maximum items per API request
+        for batch_items in self.iter_item_pages(token, seller_id, limit, status, attrs):
+            collected_items.extend(batch_items)
+        return collected_items
 
-        while True:
-            # Calculate how many items to request this round
-            if limit is not None:
-                remaining = limit - len(collected_items)
-                if remaining <= 0:
-                    break
-                current_limit = min(page_size, remaining)
-            else:
-                current_limit = page_size
+    def _item_search_page(self, token, seller_id, offset, limit, status, attrs):
+        """
+        Fetch one items search page plus full details for each listed item.
+
+        Returns (batch_ids, batch_items, paging, error); error is the
+        exception that stopped the search request, or None.
+        """
+        params = {"limit": limit, "offset": offset, "status": status}
+        try:
+            result = self._req("GET", f"/users/{seller_id}/items/search", params=params)
+        except Exception as e:
+            return [], [], {}, e
+        batch_ids = result.get("results", [])
 
-            params = {"limit": current_limit, "offset": offset, "status": status}
+        # Fetch full item details for this batch, MULTIGET_MAX_IDS per request
+        batch_items = self.get_items_multiget(token, batch_ids, attrs)
 
-            try:
-                result = self._req(
-                    "GET", f"/users/{seller_id}/items/search", params=params
+        return batch_ids, batch_items, result.get("paging", {}), None
+
+    def iter_item_pages(
+        self, token, seller_id, limit=None, status="active", attrs=None
+    ):
+        """
+        Yield a seller's items one search page at a time (list of full item
+        dicts per page), so callers can start processing before the whole
+        catalog has been fetched.
+
+        Once the first page reports paging.total, the remaining pages are
+        fetched concurrently (up to MAX_CONCURRENT_PAGES in flight) and
+        yielded in offset order.
+
+        Takes the same arguments as get_items.
+        """
+        self._auth(token)
+
+        page_size = 100  # Maximum items per API request
+        first_limit = page_size if limit is None else min(page_size, limit)
+        if first_limit <= 0:
+            return
+
+        batch_ids, batch_items, paging, error = self._item_search_page(
+            token, seller_id, 0, first_limit, status, attrs
+        )
+        if error is not None:
+            print(f"Error fetching items batch at offset 0: {error}")
+            return
+        if batch_items:
+            yield batch_items
+        # Stop if we got fewer items than requested (end of data)
+        if len(batch_ids) < first_limit:
+            return
+
+        collected = len(batch_items)
+        offset = len(batch_ids)
+        total = paging.get("total")
+
+        if total is None:
+            # No total to plan against: keep paging until a short/empty page
+            while True:
+                # Calculate how many items to request this round
+                if limit is not None:
+                    remaining = limit - collected
+                    if remaining <= 0:
+                        break
+                    current_limit = min(page_size, remaining)
+                else:
+                    current_limit = page_size
+
+                batch_ids, batch_items, _, error = self._item_search_page(
+                    token, seller_id, offset, current_limit, status, attrs
                 )
-                batch_ids = result.get("results", [])
-
-                if not batch_ids:
-                    break  # No more items
-
-                # Fetch full item details for this batch
-                batch_items = []
-                for item_id in batch_ids:
-                    try:
-                        item_details = self.get_item(token, item_id)
-                        if item_details:
-                            batch_items.append(item_details)
-                    except Exception as e:
-                        print(f"Warning: Failed to get details for item {item_id}: {e}")
-                        continue
-
-                collected_items.extend(batch_items)
+                if error is not None:
+                    print(f"Error fetching items batch at offset {offset}: {error}")
+                    break
+                if limit is not None:
+                    batch_items = batch_items[: limit - collected]
+                if batch_items:
+                    collected += len(batch_items)
+                    yield batch_items
                 offset += len(batch_ids)
 
-                # Stop if we got fewer items than requested (end of data)
                 if len(batch_ids) < current_limit:
                     break
-
-            except Exception as e:
-                print(f"Error fetching items batch at offset {offset}: {e}")
-                break
-
-        return collected_items[:limit] if limit else collected_items
+            return
+
+        # Remaining pages are independent offsets; fetch them concurrently
+        target = total if limit is None else min(limit, total)
+        pages = [
+            (page_offset, min(page_size, target - page_offset))
+            for page_offset in range(offset, target, page_size)
+        ]
+        if not pages:
+            return
+
+        workers = min(MAX_CONCURRENT_PAGES, len(pages))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Only `workers` pages are in flight at once, so memory stays flat
+            # however slowly the caller consumes them
+            results = bounded_map(
+                executor,
+                lambda page: self._item_search_page(
+                    token, seller_id, page[0], page[1], status, attrs
+                ),
+                pages,
+                workers,
+            )
+            for (page_offset, page_limit), (batch_ids, batch_items, _, error) in zip(
+                pages, results
+            ):
+                if error is not None:
+                    print(
+                        f"Error fetching items batch at offset {page_offset}: {error}"
+                    )
+                    break
+                if batch_items:
+                    yield batch_items
+                # a short page means the catalog ran out early
+                if len(batch_ids) < page_limit:
+                    break
+        finally:
+            # Don't fetch pages nobody will consume after an early stop
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def get_item(self, token, item_id, attrs=None):
         self._auth(token)
         params = {"attributes": attrs} if attrs else {}
         return self._req("GET", f"/items/{item_id}", params=params)
 
+    def get_items_multiget(self, token, item_ids, attrs=None):
+        """
+        Fetch full details for many items via the /items?ids= multi-get
+        endpoint, MULTIGET_MAX_IDS per request instead of one call each.
+        The chunk requests run concurrently (up to MULTIGET_WORKERS).
+
+        Returns the item dicts that were found, in the order of `item_ids`.
+        If a multi-get request fails, its ids are fetched one by one,
+        also concurrently.
+        """
+        self._auth(token)
+        chunks = [
+            item_ids[start : start + MULTIGET_MAX_IDS]
+            for start in range(0, len(item_ids), MULTIGET_MAX_IDS)
+        ]
+        if len(chunks) <= 1:
+            return [
+                item
+                for chunk in chunks
+                for item in self._multiget_chunk(token, chunk, attrs)
+            ]
+
+        # map() keeps chunk order, so items come back in item_ids order
+        with ThreadPoolExecutor(
+            max_workers=min(MULTIGET_WORKERS, len(chunks))
+        ) as executor:
+            results = executor.map(
+                lambda chunk: self._multiget_chunk(token, chunk, attrs), chunks
+            )
+            return [item for chunk_items in results for item in chunk_items]
+
+    def _multiget_chunk(self, token, chunk, attrs):
+        """Fetch one multi-get chunk, falling back to per-item GETs on failure."""
+        params = {"ids": ",".join(chunk)}
+        if attrs:
+            params["attributes"] = attrs
+        try:
+            results = self._req("GET", "/items", params=params)
+        except Exception as e:
+            print(f"Warning: Multi-get failed, fetching items one by one: {e}")
+            with ThreadPoolExecutor(
+                max_workers=min(MULTIGET_WORKERS, len(chunk))
+            ) as executor:
+                fetched = executor.map(
+                    lambda item_id: self._get_item_or_none(token, item_id, attrs),
+                    chunk,
+                )
+                return [item for item in fetched if item]
+
+        # Each entry is {"code": ..., "body": ...}, one per requested id
+        items = []
+        for item_id, entry in zip(chunk, results):
+            if entry.get("code") == 200 and entry.get("body"):
+                items.append(entry["body"])
+            else:
+                print(
+                    f"Warning: Failed to get details for item {item_id}: "
+                    f"HTTP {entry.get('code')}"
+                )
+        return items
+
+    def _get_item_or_none(self, token, item_id, attrs=None):
+        """get_item for bulk callers: failures are reported and yield None."""
+        try:
+            return self.get_item(token, item_id, attrs)
+        except Exception as e:
+            print(f"Warning: Failed to get details for item {item_id}: {e}")
+            return None
+
     def get_desc(self, token, item_id):
         self._auth(token)
         try:
@@ -202,11 +469,11 @@ class MLClient:
 
     def get_listing_types(self, token, site_id):
         self._auth(token)
-        return self._req("GET", f"/sites/{site_id}/listing_types")
+        return self._get_metadata(f"/sites/{site_id}/listing_types")
 
     def get_listing_exposures(self, token, site_id):
         self._auth(token)
-        return self._req("GET", f"/sites/{site_id}/listing_exposures")
+        return self._get_metadata(f"/sites/{site_id}/listing_exposures")
 
     def search(
         self,
@@ -218,47 +485,53 @@ class MLClient:
         limit=50,
         offset=0,
     ):
-        # Authenticate immediately
-        self._auth(token)
-
-        # Always build the same param dictionary
-        params = {"limit": limit, "offset": offset}
-        if query:
-            params["q"] = query
-        if seller_id:
-            params["seller_id"] = seller_id
-        if category:
-            params["category"] = category
-
         # 1) Try the generic /sites/{site_id}/search
         try:
-            return self._req("GET", f"/sites/{site_id}/search", params=params)
-        except Exception as e:
-            # If it fails with 403 or 401, fall back to "items by seller" if we can
-            msg = str(e).lower()
-            if "403" in msg or "401" in msg:
-                # If caller already passed seller_id, just re‐raise (nothing else to try)
-                if seller_id:
-                    raise
-
-                # Otherwise, fetch the user's own ID and do /users/{id}/items/search
-                user = self.get_user(token)  # returns JSON with "id" field
-                fallback_seller = user["id"]
-                return self.get_items(token, fallback_seller, limit=limit)
-            # For any other exception, re‐raise
-            raise
+            return self.search_site(
+                token, site_id, query, seller_id, category, limit, offset
+            )
+        except MLHTTPError as e:
+            # Only an auth refusal can be worked around, and only when the
+            # caller didn't already narrow the search to a seller
+            if e.status not in (401, 403) or seller_id:
+                raise
+
+            # Otherwise, fetch the user's own ID and do /users/{id}/items/search
+            user = self.get_user(token)  # returns JSON with "id" field
+            fallback_seller = user["id"]
+            return self.get_items(token, fallback_seller, limit=limit)
+
+    def search_site(
+        self,
+        token,
+        site_id,
+        query=None,
+        seller_id=None,
+        category=None,
+        limit=50,
+        offset=0,
+    ):
+        """GET /sites/{site_id}/search, without search()'s seller fallback."""
+        self._auth(token)
+        params = {
+            key: value
+            for key, value in (
+                ("q", query),
+                ("seller_id", seller_id),
+                ("category", category),
+            )
+            if value
+        }
+        params["limit"] = limit
+        params["offset"] = offset
+        return self._req("GET", f"/sites/{site_id}/search", params=params)
 
+    # Transient failures are already retried by the session adapter
     def get_categories(self, token, site_id):
-        try:
-            return self._req("GET", f"/sites/{site_id}/categories")
-        except Exception:
-            return self._req("GET", f"/sites/{site_id}/categories")
+        return self._get_metadata(f"/sites/{site_id}/categories")
 
     def get_category(self, token, category_id):
-        try:
-            return self._req("GET", f"/categories/{category_id}")
-        except Exception:
-            return self._req("GET", f"/categories/{category_id}")
+        return self._get_metadata(f"/categories/{category_id}")
 
     def get_trends(self, token, site_id, category_id=None):
         endpoint = f"/trends/{site_id}"
@@ -277,31 +550,54 @@ class MLClient:
             )
             return {
                 "valid": resp.status_code == 204,
-                "errors": resp.json() if resp.status_code != 204 else None,
+                "errors": (
+                    orjson.loads(resp.content) if resp.status_code != 204 else None
+                ),
             }
         except Exception as e:
             return {"valid": False, "errors": str(e)}
 
 
 # Token management
+
+# Parsed token files by path, as (mtime_ns, tokens); reused until the file
+# changes on disk
+_token_cache = {}
+
+
+def _token_file_mtime():
+    try:
+        return os.stat(cfg.token_file).st_mtime_ns
+    except OSError:
+        return None
+
+
 def save_tokens(tokens):
     tokens["expires_at"] = (
         datetime.now() + timedelta(seconds=tokens["expires_in"])
     ).isoformat()
     with open(cfg.token_file, "w") as f:
-        json.dump(tokens, f)
+        f.write(orjson.dumps(tokens).decode())
+    _token_cache.pop(cfg.token_file, None)
 
 
 def load_tokens():
     if os.path.exists(cfg.token_file):
+        mtime = _token_file_mtime()
+        cached = _token_cache.get(cfg.token_file)
+        if mtime is not None and cached and cached[0] == mtime:
+            return dict(cached[1])
         with open(cfg.token_file) as f:
-            return json.load(f)
+            tokens = orjson.loads(f.read())
+        if mtime is not None:
+            _token_cache[cfg.token_file] = (mtime, tokens)
+        return dict(tokens)
     return {
-        "access_token": cfg.fallback_access,
+        "access_token": fallback_access(),
         "token_type": "Bearer",
         "expires_in": 21600,
-        "refresh_token": cfg.fallback_refresh,
-        "expires_at": cfg.fallback_expires,
+        "refresh_token": fallback_refresh(),
+        "expires_at": fallback_expires(),
     }
 
 
@@ -312,8 +608,20 @@ def is_valid(tokens):
     return datetime.now() < expires_at - timedelta(minutes=5)
 
 
-def refresh_token(refresh_token):
-    resp = requests.post(
+# Kept alive between refreshes so each one reuses the TLS connection instead
+# of opening a throwaway session. RETRY_POLICY still retries token POSTs that
+# fail to connect, but POST is outside its allowed methods, so error statuses
+# and read failures are not retried.
+_oauth_session = requests.Session()
+_oauth_session.mount("https://", HTTPAdapter(max_retries=RETRY_POLICY))
+
+
+def refresh_token(refresh_token, session=None):
+    """
+    Exchange `refresh_token` for new tokens. Pass `session` to send the
+    request over an existing pooled session instead of the shared one.
+    """
+    resp = (session or _oauth_session).post(
         f"{cfg.api_url}/oauth/token",
         data={
             "grant_type": "refresh_token",
@@ -324,7 +632,7 @@ def refresh_token(refresh_token):
         timeout=cfg.timeout,
     )
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
 
 
 def get_token():
@@ -345,4 +653,6 @@ def get_token():
 
 
 def create_client():
-    return MLClient(), get_token()
+    client, token = MLClient(), get_token()
+    client.set_token(token)
+    return client, token
@@ -2,7 +2,8 @@
 # src/extractors/orders_extractor.py
 
 import logging
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Dict, Any
 
 from src.extractors.ml_api_client import create_client, MLClient
 
@@ -10,30 +11,22 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
 
-def extract_orders(
+def iter_orders(
     seller_id: str,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
     sort: str = "date_created",
     limit: int = 100,
     max_records: Optional[int] = None,
-) -> List[Dict[str, Any]]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Extracts orders for a given seller from the ML API using pagination.
-
-    Args:
-        seller_id: The seller identifier as a string.
-        date_from: ISO-8601 date string for starting filter (inclusive).
-        date_to: ISO-8601 date string for ending filter (inclusive).
-        sort: Field to sort by (e.g., 'date_created').
-        limit: Page size (number of records to fetch per call).
-        max_records: Optional cap on total records to retrieve.
+    Yields orders for a given seller from the ML API as pages arrive, so
+    callers can process them without holding every order in memory.
 
-    Returns:
-        A list of raw order dictionaries as returned by the API.
+    Takes the same arguments as extract_orders.
     """
     client, token = create_client()
-    all_orders: List[Dict[str, Any]] = []
+    fetched = 0
     offset = 0
 
     logger.info(
@@ -43,44 +36,84 @@ def extract_orders(
         date_to,
     )
 
-    while True:
+    def fetch_page(page_offset: int) -> Dict[str, Any]:
         # Fetch one “page” of orders
-        page = client.get_orders(
+        return client.get_orders(
             token,
             seller_id,
             date_from=date_from,
             date_to=date_to,
             sort=sort,
             limit=limit,
-            offset=offset,
+            offset=page_offset,
         )
 
-        batch = page.get("results", [])
-        if not batch:
-            logger.debug("No more orders returned at offset %d", offset)
-            break
-
-        all_orders.extend(batch)
-        logger.info(
-            "Fetched %d orders (offset %d – total so far %d)",
-            len(batch),
-            offset,
-            len(all_orders),
-        )
+    # One page is always in flight: as soon as page N arrives, page N+1 is
+    # requested, so its round-trip overlaps with handling page N
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_page, offset)
+        while future is not None:
+            page = future.result()
+            future = None
+
+            batch = page.get("results", [])
+            if not batch:
+                logger.debug("No more orders returned at offset %d", offset)
+                break
+
+            # Advance offset for next page
+            # Use returned paging info if available, else fall back to offset + limit
+            paging = page.get("paging", {})
+            next_offset = paging.get("offset", offset) + paging.get("limit", limit)
+
+            # Prefetch unless max_records will already be met by this batch
+            if not max_records or fetched + len(batch) < max_records:
+                future = executor.submit(fetch_page, next_offset)
+
+            # Honor max_records if provided
+            if max_records and fetched + len(batch) >= max_records:
+                batch = batch[: max_records - fetched]
+            fetched += len(batch)
+            logger.info(
+                "Fetched %d orders (offset %d – total so far %d)",
+                len(batch),
+                offset,
+                fetched,
+            )
+            yield from batch
+
+            if max_records and fetched >= max_records:
+                logger.info("Reached max_records limit of %d", max_records)
+                break
+
+            offset = next_offset
+
+    logger.info("Completed extraction: total orders fetched = %d", fetched)
 
-        # Honor max_records if provided
-        if max_records and len(all_orders) >= max_records:
-            all_orders = all_orders[:max_records]
-            logger.info("Reached max_records limit of %d", max_records)
-            break
 
-        # Advance offset for next page
-        # Use returned paging info if available, else fall back to offset + limit
-        paging = page.get("paging", {})
-        offset = paging.get("offset", offset) + paging.get("limit", limit)
+def extract_orders(
+    seller_id: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    sort: str = "date_created",
+    limit: int = 100,
+    max_records: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Extracts orders for a given seller from the ML API using pagination.
 
-    logger.info("Completed extraction: total orders fetched = %d", len(all_orders))
-    return all_orders
+    Args:
+        seller_id: The seller identifier as a string.
+        date_from: ISO-8601 date string for starting filter (inclusive).
+        date_to: ISO-8601 date string for ending filter (inclusive).
+        sort: Field to sort by (e.g., 'date_created').
+        limit: Page size (number of records to fetch per call).
+        max_records: Optional cap on total records to retrieve.
+
+    Returns:
+        A list of raw order dictionaries as returned by the API.
+    """
+    return list(iter_orders(seller_id, date_from, date_to, sort, limit, max_records))
 
 
-__all__ = ["extract_orders"]
+__all__ = ["extract_orders", "iter_orders"]
@@ -1,64 +1,237 @@
 # src/loaders/data_loader.py
 """Generic loader for persisting product data to database."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 import logging
+import weakref
 
 from src.models.models import Item, PriceHistory, Seller, create_all_tables
 from src.models.models import Order, Buyer, OrderItem  # Add to the imports
 
 logger = logging.getLogger(__name__)
 
+# Applied to every new SQLite connection: WAL lets readers (e.g. integrity
+# checks) run while a load is writing, and with synchronous=NORMAL a commit
+# no longer waits on fsync (WAL keeps it durable across crashes, short of
+# power loss). Temp tables/indexes stay in memory, plus a 64 MB page cache
+# and 256 MB of memory-mapped reads
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
 
-def load_items_to_db(enriched_items, db_url="sqlite:///./data/noneca_analytics.db"):
+# Keys of an enriched record that map onto Item columns, resolved once
+# instead of an attribute lookup per key per record
+ITEM_COLUMNS = frozenset(Item.__table__.columns.keys())
+
+# Item columns refreshed when an existing item is loaded again. These field
+# sets are frozensets so each record is matched with one C-level
+# intersection against its keys rather than a membership test per field
+ITEM_MUTABLE_FIELDS = frozenset(
+    (
+        "title",
+        "category_id",
+        "current_price",
+        "original_price",
+        "available_quantity",
+        "sold_quantity",
+        "condition",
+        "brand",
+        "size",
+        "color",
+        "gender",
+        "views",
+        "conversion_rate",
+        "seller_id",
+        "updated_at",
+    )
+)
+
+# Order columns taken from an enriched order record (besides order_id)
+ORDER_FIELDS = frozenset(
+    (
+        "status",
+        "total_amount",
+        "total_fees",
+        "profit_margin",
+        "currency_id",
+        "seller_id",
+        "buyer_id",
+        "date_created",
+        "date_closed",
+    )
+)
+
+# OrderItem columns taken from each line item (besides order_id)
+ORDER_ITEM_FIELDS = frozenset(
+    (
+        "item_id",
+        "quantity",
+        "unit_price",
+        "sale_fee",
+        "listing_type",
+        "variation_id",
+    )
+)
+
+# Enriched orders written and committed per transaction by load_orders_to_db
+ORDER_LOAD_CHUNK = 500
+
+# Enriched items per load_items_to_db call when a pipeline streams items
+ITEM_LOAD_CHUNK = 500
+
+# Keys per IN (...) lookup, well under SQLite's bound-parameter limit
+KEY_LOOKUP_CHUNK = 500
+
+
+def create_db_engine(db_url="sqlite:///./data/noneca_analytics.db"):
+    """Create an engine for `db_url`, tuning SQLite connections as they open."""
+    engine = create_engine(db_url, echo=False, future=True)
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in SQLITE_PRAGMAS:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+    return engine
+
+
+@lru_cache(maxsize=8)
+def _shared_engine(db_url):
+    """Engine for `db_url`, reused by every loader call that doesn't pass one."""
+    return create_db_engine(db_url)
+
+
+# Engines whose tables have already been created in this process
+_schema_ready = weakref.WeakSet()
+
+
+def _ensure_tables(engine):
+    """Run create_all_tables once per engine rather than on every load."""
+    if engine not in _schema_ready:
+        create_all_tables(engine)
+        _schema_ready.add(engine)
+
+
+def _coerce_key(column, key):
+    """
+    Convert `key` to the Python type of primary key `column`, so ids that
+    arrive as strings (e.g. "354140329" for an Integer column) compare equal
+    to the values the database returns. Unconvertible keys pass through.
+    """
+    python_type = column.type.python_type
+    if key is None or isinstance(key, python_type):
+        return key
+    try:
+        return python_type(key)
+    except (TypeError, ValueError):
+        return key
+
+
+def _existing_keys(session, column, keys):
+    """
+    Return the subset of `keys` already stored in primary key `column`,
+    coerced with _coerce_key.
+    """
+    keys = list({_coerce_key(column, key) for key in keys})
+    existing = set()
+    for start in range(0, len(keys), KEY_LOOKUP_CHUNK):
+        chunk = keys[start : start + KEY_LOOKUP_CHUNK]
+        existing.update(session.scalars(select(column).where(column.in_(chunk))))
+    return existing
+
+
+def _upsert_target(column, pk, inserts, updates, existing):
+    """
+    Return the pending mapping that changes for row `pk` should be merged into,
+    or None if the row is new to both this batch and the database
+    (`existing`, from _existing_keys). `pk` must already be coerced with
+    _coerce_key.
+    """
+    if pk in inserts:
+        return inserts[pk]
+    if pk in existing:
+        return updates.setdefault(pk, {column.key: pk})
+    return None
+
+
+def _bulk_write(session, model, inserts, updates):
+    """Write the collected mappings for `model`, one executemany per key set."""
+    if inserts:
+        session.bulk_insert_mappings(model, list(inserts.values()))
+    # A mapping holding only the primary key has nothing to update
+    updates = [mapping for mapping in updates.values() if len(mapping) > 1]
+    if updates:
+        session.bulk_update_mappings(model, updates)
+
+
+def load_items_to_db(
+    enriched_items, db_url="sqlite:///./data/noneca_analytics.db", engine=None
+):
     """
     Upsert a list of enriched item dicts into `items` and append to `price_history`.
     If seller info is embedded, upsert into `sellers` as well.
+
+    Pass `engine` to use a specific connection pool; otherwise one engine per
+    `db_url` is created on first use and shared by later calls.
     """
     if not enriched_items:
         logger.info("No items to load")
         return
 
-    engine = create_engine(db_url, echo=False, future=True)
+    if engine is None:
+        engine = _shared_engine(db_url)
     Session = sessionmaker(bind=engine)
-    create_all_tables(engine)
+    _ensure_tables(engine)
 
     session = Session()
+    # Rows are collected as plain dicts keyed by primary key (repeated ids in
+    # the batch merge into one mapping) and written in bulk at the end,
+    # skipping per-row ORM object and unit-of-work overhead
+    new_items, item_updates = {}, {}
+    new_sellers, seller_updates = {}, {}
+    price_rows = []
     try:
+        # One lookup per table up front instead of a SELECT per record
+        existing_items = _existing_keys(
+            session, Item.item_id, {r.get("item_id") for r in enriched_items} - {None}
+        )
+        existing_sellers = _existing_keys(
+            session,
+            Seller.seller_id,
+            {r.get("seller_id") for r in enriched_items} - {None},
+        )
+
         for record in enriched_items:
-            item_id = record.get("item_id")
+            item_id = _coerce_key(Item.item_id, record.get("item_id"))
             if not item_id:
                 continue  # skip invalid entries
 
             # Upsert item
-            existing = session.get(Item, item_id)
-            if existing:
+            existing = _upsert_target(
+                Item.item_id, item_id, new_items, item_updates, existing_items
+            )
+            if existing is not None:
                 # Update only the mutable fields
-                for field in (
-                    "title",
-                    "category_id",
-                    "current_price",
-                    "original_price",
-                    "available_quantity",
-                    "sold_quantity",
-                    "condition",
-                    "brand",
-                    "size",
-                    "color",
-                    "gender",
-                    "views",
-                    "conversion_rate",
-                    "seller_id",
-                    "updated_at",
-                ):
-                    if field in record:
-                        setattr(existing, field, record[field])
-                session.add(existing)
+                for field in ITEM_MUTABLE_FIELDS.intersection(record):
+                    existing[field] = record[field]
             else:
-                item_kwargs = {k: record[k] for k in record.keys() if hasattr(Item, k)}
-                session.add(Item(**item_kwargs))
+                new_items[item_id] = {
+                    k: v for k, v in record.items() if k in ITEM_COLUMNS
+                }
 
             # Optionally upsert seller if detailed info present
             seller_info = {
@@ -69,27 +242,41 @@ def load_items_to_db(enriched_items, db_url="sqlite:///./data/noneca_analytics.d
                 "is_competitor": record.get("is_competitor"),
                 "market_share_pct": record.get("market_share_pct"),
             }
-            sid = seller_info.get("seller_id")
+            sid = seller_info["seller_id"] = _coerce_key(
+                Seller.seller_id, seller_info["seller_id"]
+            )
             if sid and any(v is not None for v in seller_info.values()):
-                existing_seller = session.get(Seller, sid)
-                if existing_seller:
+                existing_seller = _upsert_target(
+                    Seller.seller_id, sid, new_sellers, seller_updates, existing_sellers
+                )
+                if existing_seller is not None:
                     for key, val in seller_info.items():
                         if key != "seller_id" and val is not None:
-                            setattr(existing_seller, key, val)
-                    session.add(existing_seller)
+                            existing_seller[key] = val
                 else:
-                    session.add(Seller(**seller_info))
+                    new_sellers[sid] = seller_info
 
             # Append price history snapshot
-            price_record = {
-                "item_id": item_id,
-                "price": record.get("current_price"),
-                "discount_percentage": record.get("discount_percentage"),
-                "competitor_rank": record.get("competitor_rank"),
-                "price_position": record.get("price_position"),
-            }
-            session.add(PriceHistory(**price_record))
+            price_rows.append(
+                {
+                    "item_id": item_id,
+                    "price": record.get("current_price"),
+                    "discount_percentage": record.get("discount_percentage"),
+                    "competitor_rank": record.get("competitor_rank"),
+                    "price_position": record.get("price_position"),
+                }
+            )
 
+        _bulk_write(session, Seller, new_sellers, seller_updates)
+        _bulk_write(session, Item, new_items, item_updates)
+        if price_rows:
+            # Append-only snapshots need no upsert bookkeeping, so they go
+            # straight through the ORM's executemany insert path. Sorting by
+            # item_id (stable, so repeats keep batch order) makes the
+            # item_id index take its new entries in key order instead of
+            # scattered across the B-tree
+            price_rows.sort(key=itemgetter("item_id"))
+            session.execute(insert(PriceHistory), price_rows)
         session.commit()
         logger.info(f"Successfully loaded {len(enriched_items)} items to database")
     except SQLAlchemyError as e:
@@ -100,20 +287,150 @@ def load_items_to_db(enriched_items, db_url="sqlite:///./data/noneca_analytics.d
         session.close()
 
 
-def load_orders_to_db(enriched_orders, db_url="sqlite:///./data/noneca_analytics.db"):
+def _stage_orders(session, records):
+    """
+    Write one chunk of enriched order records through `session` (without
+    committing) and return how many new orders, buyers, sellers and order
+    items it added.
+    """
+    # Rows are collected as plain dicts keyed by primary key and written in
+    # bulk at the end, as in load_items_to_db
+    new_buyers, buyer_updates = {}, {}
+    new_sellers, seller_updates = {}, {}
+    new_orders, order_updates = {}, {}
+    order_item_rows = []
+    orders_loaded = 0
+    buyers_loaded = 0
+    sellers_loaded = 0
+    order_items_loaded = 0
+
+    # One lookup per table up front instead of a SELECT per record
+    existing_buyers = _existing_keys(
+        session,
+        Buyer.buyer_id,
+        {r.get("buyer_id") for r in records} - {None},
+    )
+    existing_sellers = _existing_keys(
+        session,
+        Seller.seller_id,
+        {r.get("seller_id") for r in records} - {None},
+    )
+    existing_orders = _existing_keys(
+        session,
+        Order.order_id,
+        {r.get("order_id") for r in records} - {None},
+    )
+
+    for record in records:
+        try:
+            # --- Upsert Buyer ---
+            buyer_id = _coerce_key(Buyer.buyer_id, record.get("buyer_id"))
+            if buyer_id:
+                existing_buyer = _upsert_target(
+                    Buyer.buyer_id,
+                    buyer_id,
+                    new_buyers,
+                    buyer_updates,
+                    existing_buyers,
+                )
+                if existing_buyer is not None:
+                    if record.get("buyer_nickname"):
+                        existing_buyer["nickname"] = record["buyer_nickname"]
+                else:
+                    new_buyers[buyer_id] = {
+                        "buyer_id": buyer_id,
+                        "nickname": record.get("buyer_nickname"),
+                    }
+                    buyers_loaded += 1
+
+            # --- Upsert Seller ---
+            seller_id = _coerce_key(Seller.seller_id, record.get("seller_id"))
+            seller_nickname = record.get("seller_nickname")
+            if seller_id:
+                existing_seller = _upsert_target(
+                    Seller.seller_id,
+                    seller_id,
+                    new_sellers,
+                    seller_updates,
+                    existing_sellers,
+                )
+                if existing_seller is not None:
+                    if seller_nickname:
+                        existing_seller["nickname"] = seller_nickname
+                else:
+                    new_sellers[seller_id] = {
+                        "seller_id": seller_id,
+                        "nickname": seller_nickname,
+                    }
+                    sellers_loaded += 1
+
+            # --- Upsert Order ---
+            order_id = _coerce_key(Order.order_id, record.get("order_id"))
+            if not order_id:
+                logger.warning(f"Skipping order with missing order_id: {record}")
+                continue
+
+            existing_order = _upsert_target(
+                Order.order_id, order_id, new_orders, order_updates, existing_orders
+            )
+            if existing_order is None:
+                existing_order = new_orders[order_id] = {"order_id": order_id}
+                orders_loaded += 1
+            # New and existing orders both take only the non-null fields
+            for field in ORDER_FIELDS.intersection(record):
+                if record[field] is not None:
+                    existing_order[field] = record[field]
+
+            # --- Insert OrderItems ---
+            items = record.get("items", [])
+            for item_data in items:
+                # Only create OrderItem if we have required fields
+                if item_data.get("item_id"):
+                    order_item_fields = {"order_id": order_id}
+                    for field in ORDER_ITEM_FIELDS.intersection(item_data):
+                        if item_data[field] is not None:
+                            order_item_fields[field] = item_data[field]
+                    order_item_rows.append(order_item_fields)
+                    order_items_loaded += 1
+
+        except Exception as e:
+            logger.error(
+                f"Error processing order {record.get('order_id', 'unknown')}: {e}"
+            )
+            continue
+
+    _bulk_write(session, Buyer, new_buyers, buyer_updates)
+    _bulk_write(session, Seller, new_sellers, seller_updates)
+    _bulk_write(session, Order, new_orders, order_updates)
+    if order_item_rows:
+        session.execute(insert(OrderItem), order_item_rows)
+    return orders_loaded, buyers_loaded, sellers_loaded, order_items_loaded
+
+
+def load_orders_to_db(
+    enriched_orders, db_url="sqlite:///./data/noneca_analytics.db", engine=None
+):
     """
     Upsert enriched order data into Buyers, Sellers, Orders, and OrderItems tables.
 
-    FIXED: Properly handle dictionary data and create ORM instances instead of
-    passing raw dictionaries to SQLAlchemy operations.
+    `enriched_orders` can be any iterable, including a generator: records are
+    consumed ORDER_LOAD_CHUNK at a time and each chunk is committed on its
+    own, so memory stays flat however many orders there are. If a chunk fails,
+    it is rolled back and earlier chunks stay committed.
+
+    Pass `engine` to use a specific connection pool; otherwise one engine per
+    `db_url` is created on first use and shared by later calls.
     """
-    if not enriched_orders:
+    records = iter(enriched_orders)
+    chunk = list(islice(records, ORDER_LOAD_CHUNK))
+    if not chunk:
         logger.info("No orders to load")
         return
 
-    engine = create_engine(db_url, echo=False, future=True)
+    if engine is None:
+        engine = _shared_engine(db_url)
     Session = sessionmaker(bind=engine)
-    create_all_tables(engine)
+    _ensure_tables(engine)
 
     session = Session()
     try:
@@ -122,117 +439,15 @@ def load_orders_to_db(enriched_orders, db_url="sqlite:///./data/noneca_analytics
         sellers_loaded = 0
         order_items_loaded = 0
 
-        for record in enriched_orders:
-            try:
-                # --- Upsert Buyer ---
-                buyer_id = record.get("buyer_id")
-                if buyer_id:
-                    existing_buyer = session.get(Buyer, buyer_id)
-                    if existing_buyer:
-                        if record.get("buyer_nickname"):
-                            existing_buyer.nickname = record["buyer_nickname"]
-                    else:
-                        # Create new Buyer instance properly
-                        new_buyer = Buyer(
-                            buyer_id=buyer_id, nickname=record.get("buyer_nickname")
-                        )
-                        session.add(new_buyer)
-                        buyers_loaded += 1
-
-                # --- Upsert Seller ---
-                seller_id = record.get("seller_id")
-                seller_nickname = record.get("seller_nickname")
-                if seller_id:
-                    existing_seller = session.get(Seller, seller_id)
-                    if existing_seller:
-                        if seller_nickname:
-                            existing_seller.nickname = seller_nickname
-                    else:
-                        # Create new Seller instance properly
-                        new_seller = Seller(
-                            seller_id=seller_id, nickname=seller_nickname
-                        )
-                        session.add(new_seller)
-                        sellers_loaded += 1
-
-                # --- Upsert Order ---
-                order_id = record.get("order_id")
-                if not order_id:
-                    logger.warning(f"Skipping order with missing order_id: {record}")
-                    continue
-
-                existing_order = session.get(Order, order_id)
-                if existing_order:
-                    # Update existing order fields
-                    for field in (
-                        "status",
-                        "total_amount",
-                        "total_fees",
-                        "profit_margin",
-                        "currency_id",
-                        "seller_id",
-                        "buyer_id",
-                        "date_created",
-                        "date_closed",
-                    ):
-                        if field in record and record[field] is not None:
-                            setattr(existing_order, field, record[field])
-                else:
-                    # Create new Order instance with only valid fields
-                    order_fields = {}
-                    for field in (
-                        "order_id",
-                        "status",
-                        "total_amount",
-                        "total_fees",
-                        "profit_margin",
-                        "currency_id",
-                        "seller_id",
-                        "buyer_id",
-                        "date_created",
-                        "date_closed",
-                    ):
-                        if field in record and record[field] is not None:
-                            order_fields[field] = record[field]
-
-                    # Create the Order instance properly
-                    new_order = Order(**order_fields)
-                    session.add(new_order)
-                    orders_loaded += 1
-
-                # --- Insert OrderItems ---
-                items = record.get("items", [])
-                for item_data in items:
-                    # Only create OrderItem if we have required fields
-                    if item_data.get("item_id"):
-                        order_item_fields = {}
-                        for field in (
-                            "order_id",
-                            "item_id",
-                            "quantity",
-                            "unit_price",
-                            "sale_fee",
-                            "listing_type",
-                            "variation_id",
-                        ):
-                            if field == "order_id":
-                                order_item_fields[field] = order_id
-                            elif field in item_data and item_data[field] is not None:
-                                order_item_fields[field] = item_data[field]
-
-                        # Create OrderItem instance properly
-                        new_order_item = OrderItem(**order_item_fields)
-                        session.add(new_order_item)
-                        order_items_loaded += 1
-
-            except Exception as e:
-                logger.error(
-                    f"Error processing order {record.get('order_id', 'unknown')}: {e}"
-                )
-                continue
+        while chunk:
+            counts = _stage_orders(session, chunk)
+            session.commit()
+            orders_loaded += counts[0]
+            buyers_loaded += counts[1]
+            sellers_loaded += counts[2]
+            order_items_loaded += counts[3]
+            chunk = list(islice(records, ORDER_LOAD_CHUNK))
 
-        # Commit all changes
-        session.commit()
         logger.info(f"Successfully loaded to database:")
         logger.info(f"  - Orders: {orders_loaded}")
         logger.info(f"  - Buyers: {buyers_loaded}")
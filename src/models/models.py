@@ -3,31 +3,44 @@
 SQLAlchemy models for products, sellers, and transactional order data,
 designed with a star schema approach for business intelligence analytics.
 """
+from contextlib import contextmanager
+
 from sqlalchemy import (
     Column,
     String,
     Integer,
     Float,
+    Numeric,
     Boolean,
     Date,
     DateTime,
     func,
     text,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
+# Monetary amounts: exact NUMERIC(12,2) on servers that have it, still read
+# back as floats so callers see the same values as before. SQLite has no
+# fixed-point storage (NUMERIC affinity would turn 10.0 into the integer 10),
+# so it keeps plain REAL there
+MONEY = Numeric(12, 2, asdecimal=False).with_variant(Float(), "sqlite")
+
 
 class Item(Base):
     __tablename__ = "items"
+    # Category/brand roll-ups read one composite index instead of
+    # intersecting the two single-column ones
+    __table_args__ = (Index("ix_items_cat_brand", "category_id", "brand"),)
 
     item_id = Column(String(50), primary_key=True)
     title = Column(String(500))
     category_id = Column(String(50), index=True)
-    current_price = Column(Float(precision=2))
-    original_price = Column(Float(precision=2))
+    current_price = Column(MONEY)
+    original_price = Column(MONEY)
     available_quantity = Column(Integer)
     sold_quantity = Column(Integer)
     condition = Column(String(20))
@@ -45,11 +58,16 @@ class Item(Base):
         onupdate=func.current_timestamp,
     )
 
-    # Relationships to link to other tables
-    seller = relationship("Seller", back_populates="items")
-    order_items = relationship("OrderItem", back_populates="item")
+    # Relationships to link to other tables. Nothing loads them implicitly:
+    # lazy="raise" turns a per-row lazy load into an error, so callers that
+    # need related rows ask for them with selectinload()/joinedload()
+    seller = relationship("Seller", back_populates="items", lazy="raise")
+    order_items = relationship("OrderItem", back_populates="item", lazy="raise")
     price_history = relationship(
-        "PriceHistory", back_populates="item", cascade="all, delete-orphan"
+        "PriceHistory",
+        back_populates="item",
+        lazy="raise",
+        cascade="all, delete-orphan",
     )
 
 
@@ -58,14 +76,14 @@ class PriceHistory(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     item_id = Column(String(50), ForeignKey("items.item_id"), index=True)
-    price = Column(Float(precision=2))
+    price = Column(MONEY)
     discount_percentage = Column(Float(precision=2))
     competitor_rank = Column(Integer, nullable=True)
     price_position = Column(String(20), nullable=True)
     recorded_at = Column(DateTime, server_default=text("CURRENT_TIMESTAMP"), index=True)
 
     # Relationship back to the Item
-    item = relationship("Item", back_populates="price_history")
+    item = relationship("Item", back_populates="price_history", lazy="raise")
 
 
 class Seller(Base):
@@ -79,8 +97,8 @@ class Seller(Base):
     market_share_pct = Column(Float(precision=2), nullable=True)
 
     # Relationships to see all items and orders from a seller
-    items = relationship("Item", back_populates="seller")
-    orders = relationship("Order", back_populates="seller")
+    items = relationship("Item", back_populates="seller", lazy="raise")
+    orders = relationship("Order", back_populates="seller", lazy="raise")
 
 
 class MarketTrend(Base):
@@ -106,18 +124,29 @@ class Buyer(Base):
     nickname = Column(String(100), nullable=True)
 
     # Relationship to see all orders from a buyer
-    orders = relationship("Order", back_populates="buyer")
+    orders = relationship("Order", back_populates="buyer", lazy="raise")
 
 
 class Order(Base):
     """Fact table for order headers, linking buyers and sellers."""
 
     __tablename__ = "orders"
+    # Per-seller sales over a date range is the main analytical filter; on
+    # PostgreSQL the index also carries the amounts so those aggregates are
+    # answered from the index alone
+    __table_args__ = (
+        Index(
+            "ix_orders_seller_date",
+            "seller_id",
+            "date_created",
+            postgresql_include=["total_amount", "profit_margin"],
+        ),
+    )
 
     order_id = Column(Integer, primary_key=True)
     status = Column(String(50), index=True)
-    total_amount = Column(Float(precision=2))
-    total_fees = Column(Float(precision=2))
+    total_amount = Column(MONEY)
+    total_fees = Column(MONEY)
     profit_margin = Column(Float(precision=2))
     currency_id = Column(String(10))
     date_created = Column(DateTime(timezone=True), index=True)
@@ -128,10 +157,10 @@ class Order(Base):
     buyer_id = Column(Integer, ForeignKey("buyers.buyer_id"), index=True)
 
     # SQLAlchemy Relationships
-    seller = relationship("Seller", back_populates="orders")
-    buyer = relationship("Buyer", back_populates="orders")
+    seller = relationship("Seller", back_populates="orders", lazy="raise")
+    buyer = relationship("Buyer", back_populates="orders", lazy="raise")
     items = relationship(
-        "OrderItem", back_populates="order", cascade="all, delete-orphan"
+        "OrderItem", back_populates="order", lazy="raise", cascade="all, delete-orphan"
     )
 
 
@@ -139,11 +168,13 @@ class OrderItem(Base):
     """Fact table for order line items, linking orders to specific products."""
 
     __tablename__ = "order_items"
+    # Order -> product joins resolve both keys from one index
+    __table_args__ = (Index("ix_order_items_order_item", "order_id", "item_id"),)
 
     order_item_id = Column(Integer, primary_key=True, autoincrement=True)
     quantity = Column(Integer)
-    unit_price = Column(Float(precision=2))  # Price at the time of sale
-    sale_fee = Column(Float(precision=2))
+    unit_price = Column(MONEY)  # Price at the time of sale
+    sale_fee = Column(MONEY)
     listing_type = Column(String(50))
     variation_id = Column(Integer)  # For tracking specific variations (color/size)
 
@@ -152,10 +183,40 @@ class OrderItem(Base):
     item_id = Column(String(50), ForeignKey("items.item_id"), index=True)
 
     # SQLAlchemy Relationships
-    order = relationship("Order", back_populates="items")
-    item = relationship("Item", back_populates="order_items")
+    order = relationship("Order", back_populates="items", lazy="raise")
+    item = relationship("Item", back_populates="order_items", lazy="raise")
 
 
 def create_all_tables(engine):
     """Create all tables in the target database."""
     Base.metadata.create_all(engine)
+
+
+def drop_secondary_indexes(engine):
+    """Drop every non-primary-key index defined on the models, if present."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(engine, checkfirst=True)
+
+
+def create_secondary_indexes(engine):
+    """Create any non-primary-key index defined on the models that is missing."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+@contextmanager
+def secondary_indexes_deferred(engine):
+    """
+    Drop secondary indexes for the duration of a bulk load and rebuild them
+    once at the end (also on failure), so each index is built in one sorted
+    pass instead of being updated row by row. Upserts only look rows up by
+    primary key, which stays indexed throughout.
+    """
+    create_all_tables(engine)
+    drop_secondary_indexes(engine)
+    try:
+        yield
+    finally:
+        create_secondary_indexes(engine)
@@ -1,21 +1,35 @@
 #!/usr/bin/env python3
 # src/transformers/order_enricher.py
 """Applies enrichment logic to order transaction data."""
-from datetime import datetime, timezone
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone, tzinfo
+from functools import partial
 from typing import List, Dict, Optional, Any
-import pytz
+from zoneinfo import ZoneInfo
 
+# Resolved once; ZoneInfo also caches instances per key
+SAO_PAULO_TZ = ZoneInfo("America/Sao_Paulo")
 
-def _parse_ml_datetime(date_str: Optional[str]) -> Optional[datetime]:
-    """Parse MercadoLibre datetime string to UTC datetime."""
+# Records sent to a worker process per task by enrich_orders_parallel
+PARALLEL_CHUNK_SIZE = 1000
+
+
+def _parse_ml_datetime(
+    date_str: Optional[str], tz: tzinfo = timezone.utc
+) -> Optional[datetime]:
+    """Parse MercadoLibre datetime string to a datetime in `tz` (UTC by default)."""
     if not date_str:
         return None
 
     try:
-        # Handle timezone-aware datetime strings
-        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-        return dt.astimezone(timezone.utc)
-    except (ValueError, AttributeError):
+        # ML timestamps normally carry a numeric offset
+        # ("2025-06-08T16:19:34.000-04:00"), which fromisoformat parses as is;
+        # only a trailing "Z" needs rewriting on Python < 3.11
+        if date_str[-1] == "Z":
+            date_str = date_str[:-1] + "+00:00"
+        return datetime.fromisoformat(date_str).astimezone(tz)
+    except (ValueError, TypeError):
         return None
 
 
@@ -24,8 +38,7 @@ def _normalize_to_sao_paulo(dt: Optional[datetime]) -> Optional[datetime]:
     if not dt:
         return None
 
-    sao_paulo_tz = pytz.timezone("America/Sao_Paulo")
-    return dt.astimezone(sao_paulo_tz)
+    return dt.astimezone(SAO_PAULO_TZ)
 
 
 def _calculate_profit_margin(total_amount: float, fees: float) -> float:
@@ -97,12 +110,15 @@ def _extract_payment_info(payments: List[Dict]) -> Dict[str, Any]:
     }
 
 
-def enrich_order(order: Dict[str, Any]) -> Dict[str, Any]:
+def enrich_order(
+    order: Dict[str, Any], processed_at: Optional[datetime] = None
+) -> Dict[str, Any]:
     """
     Enrich a single order with computed fields and standardized format.
 
     Args:
         order: Raw order dictionary from API
+        processed_at: Processing timestamp; defaults to the current UTC time
 
     Returns:
         Enriched order dictionary
@@ -114,10 +130,10 @@ def enrich_order(order: Dict[str, Any]) -> Dict[str, Any]:
     order_id = order.get("id")
     total_amount = float(order.get("total_amount", 0))
 
-    # Extract timestamps
-    date_created = _parse_ml_datetime(order.get("date_created"))
-    date_closed = _parse_ml_datetime(order.get("date_closed"))
-    last_updated = _parse_ml_datetime(order.get("last_updated"))
+    # Extract timestamps, converted straight to São Paulo time
+    date_created = _parse_ml_datetime(order.get("date_created"), SAO_PAULO_TZ)
+    date_closed = _parse_ml_datetime(order.get("date_closed"), SAO_PAULO_TZ)
+    last_updated = _parse_ml_datetime(order.get("last_updated"), SAO_PAULO_TZ)
 
     # Extract participants
     buyer = order.get("buyer", {})
@@ -129,14 +145,18 @@ def enrich_order(order: Dict[str, Any]) -> Dict[str, Any]:
     # Extract order items
     items = _extract_order_items(order.get("order_items", []))
 
-    # Calculate business metrics
-    total_fees = sum(item.get("sale_fee", 0) for item in items)
+    # Calculate business metrics; fees and quantity in one pass over items
+    total_fees = 0
+    total_quantity = 0
+    for item in items:
+        total_fees += item["sale_fee"]
+        total_quantity += item["quantity"]
     profit_margin = _calculate_profit_margin(total_amount, total_fees)
     avg_item_price = total_amount / len(items) if items else 0.0
-    total_quantity = sum(item.get("quantity", 0) for item in items)
 
     # Processing timestamp
-    processed_at = datetime.now(timezone.utc)
+    if processed_at is None:
+        processed_at = datetime.now(timezone.utc)
 
     return {
         # Order identification
@@ -161,9 +181,9 @@ def enrich_order(order: Dict[str, Any]) -> Dict[str, Any]:
         "seller_id": seller.get("id"),
         "seller_nickname": seller.get("nickname"),
         # Timestamps (normalized to São Paulo)
-        "date_created": _normalize_to_sao_paulo(date_created),
-        "date_closed": _normalize_to_sao_paulo(date_closed),
-        "last_updated": _normalize_to_sao_paulo(last_updated),
+        "date_created": date_created,
+        "date_closed": date_closed,
+        "last_updated": last_updated,
         "processed_at": processed_at,
         # Order metrics
         "total_items": len(items),
@@ -194,7 +214,58 @@ def enrich_orders(raw_orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not raw_orders:
         return []
 
-    return [enrich_order(order) for order in raw_orders if order]
+    # One processing timestamp for the whole batch instead of a clock read
+    # per order
+    processed_at = datetime.now(timezone.utc)
+    return _enrich_order_chunk(raw_orders, processed_at)
+
+
+def _enrich_order_chunk(
+    orders: List[Dict[str, Any]], processed_at: datetime
+) -> List[Dict[str, Any]]:
+    """Enrich one chunk of orders; module-level so worker processes can run it."""
+    return [enrich_order(order, processed_at) for order in orders if order]
+
+
+def enrich_orders_parallel(
+    raw_orders: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Enrich orders across a pool of worker processes, in input order.
+
+    Each order is enriched independently and the work is pure CPU, so
+    separate processes sidestep the GIL. All orders share one processed_at.
+    Opt-in only: enrich_orders never switches to it. Call it from a
+    single-threaded entry point with a batch large enough (thousands of
+    orders) to pay for pickling records to and from the workers.
+
+    Args:
+        raw_orders: List of raw order dictionaries from API
+        workers: Number of worker processes; defaults to the CPU count
+        chunk_size: Orders sent to a worker per task
+
+    Returns:
+        List of enriched order dictionaries
+    """
+    if not raw_orders:
+        return []
+
+    processed_at = datetime.now(timezone.utc)
+    chunks = [
+        raw_orders[start : start + chunk_size]
+        for start in range(0, len(raw_orders), chunk_size)
+    ]
+    # Workers are spawned, not forked: a fork copies the parent's threads'
+    # held locks (logging, queue listeners) and can deadlock the child
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = executor.map(
+            partial(_enrich_order_chunk, processed_at=processed_at), chunks
+        )
+        return [order for chunk in results for order in chunk]
 
 
 def enrich_orders_from_json(json_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -1,8 +1,14 @@
 # src/transformers/product_enricher.py
 """Applies enrichment logic to product catalog data."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
 from typing import List, Dict, Optional, Any
 
+# Records sent to a worker process per task by enrich_items_parallel
+PARALLEL_CHUNK_SIZE = 1000
+
 
 def _get_attr(attrs: Optional[List[Dict]], key: str) -> Optional[str]:
     """Extract attribute value by key from attributes list."""
@@ -17,6 +23,19 @@ def _get_attr(attrs: Optional[List[Dict]], key: str) -> Optional[str]:
     return None
 
 
+def _index_attrs(attrs: Optional[List[Dict]]) -> Dict[str, Optional[str]]:
+    """
+    Map attribute id to value in one pass, so several keys can be looked up
+    without rescanning the list. Like _get_attr, the first entry for an id wins.
+    """
+    index = {}
+    for attr in attrs or ():
+        key = attr.get("id")
+        if key not in index:
+            index[key] = attr.get("value_name") or attr.get("value_id") or None
+    return index
+
+
 def _safe_divide(numerator: float, denominator: float, precision: int = 4) -> float:
     """Safely divide two numbers, returning 0.0 if denominator is 0."""
     if not denominator:
@@ -31,12 +50,15 @@ def _calculate_discount_percentage(original: float, current: float) -> float:
     return round((original - current) / original * 100, 2)
 
 
-def enrich_item(item: Dict[str, Any]) -> Dict[str, Any]:
+def enrich_item(
+    item: Dict[str, Any], timestamp: Optional[datetime] = None
+) -> Dict[str, Any]:
     """
     Enrich a single item with computed fields and standardized format.
 
     Args:
         item: Raw item dictionary from API
+        timestamp: created_at/updated_at value; defaults to the current UTC time
 
     Returns:
         Enriched item dictionary
@@ -44,14 +66,14 @@ def enrich_item(item: Dict[str, Any]) -> Dict[str, Any]:
     if not item:
         return {}
 
-    attrs = item.get("attributes", [])
+    attrs = _index_attrs(item.get("attributes"))
     seller_info = item.get("seller", {})  # Extract the full seller object
 
     # Extract attributes - note the correct attribute key for color
-    brand = _get_attr(attrs, "BRAND")
-    size = _get_attr(attrs, "SIZE")
-    color = _get_attr(attrs, "MAIN_COLOR")  # Fixed: was "COLOR", should be "MAIN_COLOR"
-    gender = _get_attr(attrs, "GENDER")
+    brand = attrs.get("BRAND")
+    size = attrs.get("SIZE")
+    color = attrs.get("MAIN_COLOR")  # Fixed: was "COLOR", should be "MAIN_COLOR"
+    gender = attrs.get("GENDER")
 
     # Calculate metrics
     views = item.get("views", 0) or 0
@@ -62,7 +84,8 @@ def enrich_item(item: Dict[str, Any]) -> Dict[str, Any]:
     original_price = float(item.get("original_price") or current_price)
     discount_pct = _calculate_discount_percentage(original_price, current_price)
 
-    timestamp = datetime.now(timezone.utc)
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
 
     return {
         "item_id": item.get("id"),
@@ -101,4 +124,51 @@ def enrich_items(raw_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not raw_items:
         return []
 
-    return [enrich_item(item) for item in raw_items if item]
+    # One timestamp for the whole batch instead of a clock read per item;
+    # the items were all fetched in the same run anyway
+    timestamp = datetime.now(timezone.utc)
+    return _enrich_item_chunk(raw_items, timestamp)
+
+
+def _enrich_item_chunk(
+    items: List[Dict[str, Any]], timestamp: datetime
+) -> List[Dict[str, Any]]:
+    """Enrich one chunk of items; module-level so worker processes can run it."""
+    return [enrich_item(item, timestamp) for item in items if item]
+
+
+def enrich_items_parallel(
+    raw_items: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Enrich items across a pool of worker processes, in input order.
+
+    Opt-in only: enrich_items never switches to it. Call it from a
+    single-threaded entry point with a batch large enough (thousands of
+    items) to pay for pickling records to and from the workers.
+
+    Args:
+        raw_items: List of raw item dictionaries from API
+        workers: Number of worker processes; defaults to the CPU count
+        chunk_size: Items sent to a worker per task
+
+    Returns:
+        List of enriched item dictionaries
+    """
+    if not raw_items:
+        return []
+
+    timestamp = datetime.now(timezone.utc)
+    chunks = [
+        raw_items[start : start + chunk_size]
+        for start in range(0, len(raw_items), chunk_size)
+    ]
+    # Workers are spawned, not forked: a fork copies the parent's threads'
+    # held locks (logging, queue listeners) and can deadlock the child
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = executor.map(partial(_enrich_item_chunk, timestamp=timestamp), chunks)
+        return [item for chunk in results for item in chunk]
@@ -5,7 +5,7 @@ import sys
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch, mock_open
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Dict, List, Any
 
 
@@ -20,9 +20,6 @@ class MockConfig:
     api_url: str = "https://api.test.com"
     auth_url: str = "https://auth.test.com"
     token_file: str = "test_tokens.json"
-    fallback_access: str = "test_access_token"
-    fallback_refresh: str = "test_refresh_token"
-    fallback_expires: str = "2025-12-31T23:59:59"
 
 
 # Mock modules
@@ -299,6 +296,164 @@ class TestMLAPIClient:
         assert reviews["rating_average"] == 4.5
         assert reviews["total_reviews"] == 25
 
+    def test_iter_item_pages_fetches_remaining_pages_in_order(self):
+        from src.extractors.ml_api_client import MLClient
+
+        catalog = [f"ML{i:03d}" for i in range(250)]
+
+        def fake_req(method, endpoint, params=None, **kwargs):
+            if endpoint == "/items":
+                ids = params["ids"].split(",")
+                assert len(ids) <= 20
+                return [{"code": 200, "body": {"id": item_id}} for item_id in ids]
+            offset, limit = params["offset"], params["limit"]
+            return {
+                "results": catalog[offset : offset + limit],
+                "paging": {"total": len(catalog)},
+            }
+
+        client = MLClient()
+        with patch.object(client, "_req", side_effect=fake_req):
+            pages = list(client.iter_item_pages("token", "seller123", limit=230))
+
+        assert [len(page) for page in pages] == [100, 100, 30]
+        assert [item["id"] for page in pages for item in page] == catalog[:230]
+
+    def test_bounded_map_keeps_window_of_calls_in_flight(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from src.extractors.ml_api_client import bounded_map
+
+        class CountingExecutor(ThreadPoolExecutor):
+            submitted = 0
+
+            def submit(self, fn, *args, **kwargs):
+                self.submitted += 1
+                return super().submit(fn, *args, **kwargs)
+
+        with CountingExecutor(max_workers=3) as executor:
+            results = bounded_map(executor, lambda page: page * 10, range(100), 3)
+            assert next(results) == 0
+            # Handing out the first result refills one slot, nothing more
+            assert executor.submitted == 4
+            assert list(results) == [page * 10 for page in range(1, 100)]
+            assert executor.submitted == 100
+
+    def test_real_client_rate_window(self):
+        from src.extractors.ml_api_client import MLClient
+
+        client = MLClient()
+        with patch_cfg(rate_limit=2), patch(
+            "src.extractors.ml_api_client.time.sleep"
+        ) as sleep:
+            client._check_rate()
+            client._check_rate()
+            sleep.assert_not_called()
+
+            # A spent budget waits out the rest of the window, then counts
+            # the call against the new one
+            client._rate_reset -= 20
+            client._check_rate()
+            assert 39 < sleep.call_args.args[0] <= 40
+            assert client._rate_calls == 1
+
+            # A window older than a minute starts counting again
+            client._rate_reset -= 61
+            client._check_rate()
+            assert client._rate_calls == 1
+            assert sleep.call_count == 1
+
+    def test_auth_only_rewrites_header_when_token_changes(self):
+        from src.extractors.ml_api_client import MLClient
+
+        client = MLClient()
+        client.set_token("tok1")
+        with patch.object(client, "set_token") as set_token:
+            client._auth("tok1")
+            set_token.assert_not_called()
+            client._auth("tok2")
+            set_token.assert_called_once_with("tok2")
+        assert client.session.headers["Authorization"] == "Bearer tok1"
+
+    def test_real_client_empty_body_returns_empty_dict(self):
+        from src.extractors.ml_api_client import MLClient
+
+        client = MLClient()
+        for status in (200, 204):
+            resp = Mock(status_code=status, content=b"")
+            with patch.object(client.session, "request", return_value=resp):
+                assert client._req("PUT", "/items/ML1") == {}
+
+    def test_search_falls_back_to_own_items_on_auth_error(self):
+        from src.extractors.ml_api_client import MLClient, MLHTTPError
+
+        client = MLClient()
+        with patch.object(
+            client, "search_site", side_effect=MLHTTPError("Forbidden", 403)
+        ), patch.object(client, "get_user", return_value={"id": 7}), patch.object(
+            client, "get_items", return_value=[{"id": "ML1"}]
+        ) as get_items:
+            assert client.search("token", "MLB", query="x") == [{"id": "ML1"}]
+            get_items.assert_called_once_with("token", 7, limit=50)
+
+            # With a seller already given there is nothing to fall back to
+            with pytest.raises(MLHTTPError):
+                client.search("token", "MLB", seller_id=7)
+
+    def test_category_metadata_is_fetched_once_per_ttl(self):
+        from src.extractors.ml_api_client import MLClient, METADATA_TTL_SECONDS
+
+        client = MLClient()
+        with patch.object(client, "_req", return_value={"id": "MLB1"}) as req:
+            client.get_category("token", "MLB1")
+            client.get_category("token", "MLB1")
+            assert req.call_count == 1
+
+            # An expired entry is fetched again
+            fetched_at, data = client._metadata_cache["/categories/MLB1"]
+            client._metadata_cache["/categories/MLB1"] = (
+                fetched_at - METADATA_TTL_SECONDS,
+                data,
+            )
+            client.get_category("token", "MLB1")
+            assert req.call_count == 2
+
+    def test_metadata_cache_returns_copies_and_evicts_lru(self):
+        from src.extractors import ml_api_client
+        from src.extractors.ml_api_client import MLClient
+
+        client = MLClient()
+        with patch.object(
+            client, "_req", side_effect=lambda method, endpoint: {"path": [endpoint]}
+        ) as req, patch.object(ml_api_client, "METADATA_CACHE_MAXSIZE", 2):
+            first = client.get_category("token", "MLB1")
+            first["path"].append("mutated")
+            assert client.get_category("token", "MLB1") == {
+                "path": ["/categories/MLB1"]
+            }
+
+            client.get_category("token", "MLB2")
+            client.get_category("token", "MLB1")  # MLB1 is now most recent
+            client.get_category("token", "MLB3")  # evicts MLB2
+            assert list(client._metadata_cache) == [
+                "/categories/MLB1",
+                "/categories/MLB3",
+            ]
+            assert req.call_count == 3
+
+    def test_get_items_multiget_falls_back_per_item(self):
+        from src.extractors.ml_api_client import MLClient
+
+        def fake_req(method, endpoint, params=None, **kwargs):
+            if endpoint == "/items":
+                raise Exception("HTTP 400")
+            return {"id": endpoint.rsplit("/", 1)[1]}
+
+        client = MLClient()
+        with patch.object(client, "_req", side_effect=fake_req):
+            items = client.get_items_multiget("token", ["ML1", "ML2"])
+
+        assert [item["id"] for item in items] == ["ML1", "ML2"]
+
 
 class TestItemsExtractor:
     """Test the items extraction functionality."""
@@ -321,7 +476,21 @@ class TestItemsExtractor:
         assert len(items) == 2
         assert items[0]["id"] == "ML001"
         mock_client.get_items.assert_called_once_with(
-            "test_token", "seller123", limit=2
+            "test_token", "seller123", limit=2, attrs=None
+        )
+
+    @patch("src.extractors.items_extractor.create_client")
+    def test_extract_items_field_projection_is_opt_in(self, mock_create_client):
+        mock_client = Mock()
+        mock_client.get_items.return_value = [{"id": "ML001"}]
+        mock_create_client.return_value = (mock_client, "test_token")
+
+        from src.extractors.items_extractor import RAW_ITEM_FIELDS, extract_items
+
+        extract_items("seller123", limit=1, attrs=RAW_ITEM_FIELDS)
+
+        mock_client.get_items.assert_called_once_with(
+            "test_token", "seller123", limit=1, attrs=RAW_ITEM_FIELDS
         )
 
     @patch("src.extractors.items_extractor.create_client")
@@ -389,11 +558,67 @@ class TestItemsExtractor:
         assert items[0]["rating_average"] == 4.0
         assert items[0]["total_reviews"] == 10
 
+    @patch("src.extractors.items_extractor.create_client")
+    def test_extract_items_with_enrichments_keeps_order(self, mock_create_client):
+        mock_client = Mock()
+        mock_client.get_items.return_value = [{"id": f"ML{i:03d}"} for i in range(60)]
+        mock_client.get_desc.side_effect = lambda token, item_id: {
+            "plain_text": f"desc {item_id}"
+        }
+        mock_create_client.return_value = (mock_client, "test_token")
+
+        from src.extractors.items_extractor import extract_items_with_enrichments
+
+        items = extract_items_with_enrichments("seller123", max_workers=8)
+
+        assert [item["id"] for item in items] == [f"ML{i:03d}" for i in range(60)]
+        assert all(item["description"] == f"desc {item['id']}" for item in items)
+
+    @patch("src.extractors.items_extractor.create_client")
+    def test_extract_items_with_no_enrichments(self, mock_create_client):
+        mock_client = Mock()
+        mock_client.get_items.return_value = [{"id": "ML123", "title": "Product"}]
+        mock_create_client.return_value = (mock_client, "test_token")
+
+        from src.extractors.items_extractor import extract_items_with_enrichments
+
+        items = extract_items_with_enrichments(
+            "seller123", include_descriptions=False, include_reviews=False
+        )
+
+        assert items == [{"id": "ML123", "title": "Product"}]
+        mock_client.get_desc.assert_not_called()
+        mock_client.get_reviews.assert_not_called()
+
+    @patch("src.extractors.items_extractor.create_client")
+    def test_iter_items_with_enrichments_streams_pages(self, mock_create_client):
+        mock_client = Mock()
+        mock_client.iter_item_pages.return_value = iter(
+            [[{"id": "ML001"}, {"id": "ML002"}], [{"id": "ML003"}]]
+        )
+        mock_client.get_desc.return_value = {"plain_text": "Description"}
+        mock_create_client.return_value = (mock_client, "test_token")
+
+        from src.extractors.items_extractor import iter_items_with_enrichments
+
+        items = iter_items_with_enrichments("seller123", limit=3)
+
+        assert [item["id"] for item in items] == ["ML001", "ML002", "ML003"]
+        mock_client.iter_item_pages.assert_called_once_with(
+            "test_token", "seller123", limit=3, attrs=None
+        )
+
+
+def patch_cfg(**overrides):
+    """Patch ml_api_client.cfg with a modified copy (Config is frozen)."""
+    from src.extractors import ml_api_client
+
+    return patch.object(ml_api_client, "cfg", replace(ml_api_client.cfg, **overrides))
+
 
 class TestTokenManagement:
     """Test token management functions."""
 
-    @patch("src.extractors.ml_api_client.cfg.token_file", "test_tokens.json")
     @patch(
         "builtins.open",
         new_callable=mock_open,
@@ -403,19 +628,56 @@ class TestTokenManagement:
     def test_load_tokens_from_file(self, mock_exists, mock_file):
         from src.extractors.ml_api_client import load_tokens
 
-        tokens = load_tokens()
+        with patch_cfg(token_file="test_tokens.json"):
+            tokens = load_tokens()
         assert tokens["access_token"] == "test123"
 
-    @patch("src.extractors.ml_api_client.cfg.fallback_access", "test_access_token")
-    @patch("src.extractors.ml_api_client.cfg.fallback_refresh", "test_refresh_token")
-    @patch("src.extractors.ml_api_client.cfg.fallback_expires", "2025-12-31T23:59:59")
     @patch("os.path.exists", return_value=False)
     def test_load_tokens_fallback(self, mock_exists):
         from src.extractors.ml_api_client import load_tokens
 
-        tokens = load_tokens()
+        with patch(
+            "src.extractors.ml_api_client.fallback_access",
+            return_value="test_access_token",
+        ), patch(
+            "src.extractors.ml_api_client.fallback_refresh",
+            return_value="test_refresh_token",
+        ), patch(
+            "src.extractors.ml_api_client.fallback_expires",
+            return_value="2025-12-31T23:59:59",
+        ):
+            tokens = load_tokens()
         assert tokens["access_token"] == "test_access_token"
 
+    def test_load_tokens_reuses_parse_until_file_changes(self, tmp_path):
+        from src.extractors.ml_api_client import load_tokens
+
+        token_file = tmp_path / "tokens.json"
+        token_file.write_text('{"access_token": "first"}')
+        with patch_cfg(token_file=str(token_file)), patch(
+            "builtins.open", wraps=open
+        ) as opened:
+            assert load_tokens()["access_token"] == "first"
+            assert load_tokens()["access_token"] == "first"
+            assert opened.call_count == 1
+
+            token_file.write_text('{"access_token": "second"}')
+            stat = token_file.stat()
+            os.utime(token_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert load_tokens()["access_token"] == "second"
+            assert opened.call_count == 2
+
+    def test_refresh_token_uses_pooled_session(self):
+        from src.extractors import ml_api_client
+
+        resp = Mock(content=b'{"access_token": "fresh"}')
+        with patch.object(
+            ml_api_client._oauth_session, "post", return_value=resp
+        ) as post:
+            tokens = ml_api_client.refresh_token("refresh123")
+        assert tokens["access_token"] == "fresh"
+        assert post.call_args.kwargs["data"]["refresh_token"] == "refresh123"
+
     def test_is_valid_token_check(self):
         from src.extractors.ml_api_client import is_valid
 
@@ -432,13 +694,13 @@ class TestTokenManagement:
         # No tokens
         assert is_valid(None) is False
 
-    @patch("src.extractors.ml_api_client.cfg.token_file", "test_tokens.json")
     @patch("builtins.open", new_callable=mock_open)
     def test_save_tokens(self, mock_file):
         from src.extractors.ml_api_client import save_tokens
 
         tokens = {"access_token": "test", "expires_in": 3600}
-        save_tokens(tokens)
+        with patch_cfg(token_file="test_tokens.json"):
+            save_tokens(tokens)
 
         # Check that file was opened for writing
         mock_file.assert_called_once_with("test_tokens.json", "w")
@@ -570,7 +832,7 @@ class TestEdgeCases:
         # Should handle large limits gracefully
         assert items == []
         mock_client.get_items.assert_called_once_with(
-            "test_token", "seller123", limit=10000
+            "test_token", "seller123", limit=10000, attrs=None
         )
 
     def test_attribute_extraction_with_malformed_data(self):
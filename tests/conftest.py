@@ -6,3 +6,16 @@ import sys
 # make the project root importable (so both src/ and config/ work)
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, ROOT)
+
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _fresh_items_client():
+    """Tests patch create_client, so never reuse a client cached by another test."""
+    from src.extractors import items_extractor
+
+    items_extractor.reset_client()
+    yield
+    items_extractor.reset_client()
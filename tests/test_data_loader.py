@@ -3,11 +3,18 @@ import tempfile
 import pytest
 from datetime import datetime, timezone
 
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, selectinload
 
-from src.loaders.data_loader import load_items_to_db
-from src.models.models import Base, Item, PriceHistory
+from src.loaders import data_loader
+from src.loaders.data_loader import (
+    create_db_engine,
+    load_items_to_db,
+    load_orders_to_db,
+)
+from src.models.models import Base, Buyer, Item, Order, OrderItem, PriceHistory, Seller
+from src.models.models import secondary_indexes_deferred
 
 
 @pytest.fixture
@@ -103,3 +110,236 @@ def test_upsert_and_history_append(temp_sqlite_db):
     h2 = session.scalars(select(PriceHistory).where(PriceHistory.item_id == "T2")).all()
     assert len(h2) == 2
     session.close()
+
+
+def test_shared_engine_across_loads(temp_sqlite_db):
+    engine = create_engine(temp_sqlite_db, future=True)
+    base = {
+        "item_id": "T3",
+        "title": "SharedEngineItem",
+        "current_price": 3.0,
+        "seller_id": 789,
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+    # db_url is ignored when an engine is supplied
+    load_items_to_db([base], db_url="sqlite:///unused.db", engine=engine)
+    load_items_to_db([{**base, "current_price": 4.0}], engine=engine)
+
+    session = Session(engine)
+    itm = session.scalars(select(Item).where(Item.item_id == "T3")).one()
+    assert itm.current_price == pytest.approx(4.0)
+    hist = session.scalars(
+        select(PriceHistory).where(PriceHistory.item_id == "T3")
+    ).all()
+    assert len(hist) == 2
+    session.close()
+    assert not os.path.exists("unused.db")
+
+
+def test_db_url_loads_share_one_engine(temp_sqlite_db):
+    record = {
+        "item_id": "T4",
+        "current_price": 1.0,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    load_items_to_db([record], db_url=temp_sqlite_db)
+    engine = data_loader._shared_engine(temp_sqlite_db)
+    load_items_to_db([{**record, "current_price": 2.0}], db_url=temp_sqlite_db)
+
+    assert data_loader._shared_engine(temp_sqlite_db) is engine
+    assert engine in data_loader._schema_ready
+
+
+def test_batch_with_shared_seller(temp_sqlite_db):
+    now = datetime.now(timezone.utc)
+    records = [
+        {
+            "item_id": f"T{i}",
+            "title": f"Item {i}",
+            "current_price": float(i),
+            "seller_id": 42,
+            "seller_nickname": "shop",
+            "updated_at": now,
+        }
+        for i in range(10, 13)
+    ]
+
+    # All three rows reference one seller that is new within this batch
+    load_items_to_db(records, db_url=temp_sqlite_db)
+
+    engine = create_engine(temp_sqlite_db, future=True)
+    session = Session(engine)
+    assert len(session.scalars(select(Item)).all()) == 3
+    assert len(session.scalars(select(Seller)).all()) == 1
+    assert session.get(Seller, 42).nickname == "shop"
+    session.close()
+
+
+def test_orders_reload_updates_existing_rows(temp_sqlite_db):
+    order = {
+        "order_id": 1,
+        "status": "paid",
+        "buyer_id": 7,
+        "buyer_nickname": "buyer",
+        "seller_id": 42,
+        "items": [{"item_id": "T1", "quantity": 2}],
+    }
+    load_orders_to_db([order], db_url=temp_sqlite_db)
+    # Existing order, buyer and seller are found up front and updated in place
+    load_orders_to_db(
+        [{**order, "status": "shipped", "seller_nickname": "shop", "items": []}],
+        db_url=temp_sqlite_db,
+    )
+
+    engine = create_engine(temp_sqlite_db, future=True)
+    session = Session(engine)
+    assert len(session.scalars(select(Order)).all()) == 1
+    assert session.get(Order, 1).status == "shipped"
+    assert session.get(Buyer, 7).nickname == "buyer"
+    assert session.get(Seller, 42).nickname == "shop"
+    assert len(session.scalars(select(OrderItem)).all()) == 1
+    session.close()
+
+
+def test_reload_with_string_ids_updates_existing_rows(temp_sqlite_db):
+    # The API hands out seller/buyer ids as strings for Integer key columns
+    item = {
+        "item_id": "T8",
+        "seller_id": "354140329",
+        "seller_nickname": "shop",
+        "current_price": 1.0,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    order = {
+        "order_id": "9",
+        "buyer_id": "7",
+        "buyer_nickname": "buyer",
+        "seller_id": "354140329",
+        "items": [],
+    }
+    for _ in range(2):
+        load_items_to_db([item], db_url=temp_sqlite_db)
+        load_orders_to_db(
+            [order, {**order, "seller_id": 354140329}], db_url=temp_sqlite_db
+        )
+
+    engine = create_engine(temp_sqlite_db, future=True)
+    session = Session(engine)
+    assert session.scalars(select(Seller.seller_id)).all() == [354140329]
+    assert session.scalars(select(Buyer.buyer_id)).all() == [7]
+    assert session.scalars(select(Order.order_id)).all() == [9]
+    session.close()
+
+
+def test_orders_from_generator_commit_per_chunk(temp_sqlite_db, monkeypatch):
+    monkeypatch.setattr(data_loader, "ORDER_LOAD_CHUNK", 2)
+    orders = (
+        {"order_id": i, "buyer_id": 7, "seller_id": 42, "items": []}
+        for i in range(1, 6)
+    )
+
+    load_orders_to_db(orders, db_url=temp_sqlite_db)
+
+    engine = create_engine(temp_sqlite_db, future=True)
+    session = Session(engine)
+    assert len(session.scalars(select(Order)).all()) == 5
+    # Later chunks find the buyer committed by the first one
+    assert len(session.scalars(select(Buyer)).all()) == 1
+    session.close()
+
+
+def test_bulk_load_rebuilds_secondary_indexes(temp_sqlite_db):
+    engine = create_engine(temp_sqlite_db, future=True)
+    record = {
+        "item_id": "T5",
+        "category_id": "C1",
+        "current_price": 1.0,
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+    with secondary_indexes_deferred(engine):
+        assert inspect(engine).get_indexes("items") == []
+        load_items_to_db([record], engine=engine)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("items")}
+    assert "ix_items_category_id" in index_names
+    assert "ix_items_cat_brand" in index_names
+    session = Session(engine)
+    assert session.get(Item, "T5").category_id == "C1"
+    session.close()
+
+
+def test_create_db_engine_enables_wal(temp_sqlite_db):
+    engine = create_db_engine(temp_sqlite_db)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NORMAL is level 1
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+    engine.dispose()
+
+
+def test_relationships_do_not_lazy_load(temp_sqlite_db):
+    engine = create_engine(temp_sqlite_db, future=True)
+    record = {
+        "item_id": "T6",
+        "seller_id": 7,
+        "current_price": 1.0,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    load_items_to_db([record], engine=engine)
+
+    session = Session(engine)
+    item = session.get(Item, "T6")
+    with pytest.raises(InvalidRequestError):
+        item.price_history
+    loaded = session.scalars(
+        select(Item).options(selectinload(Item.price_history))
+    ).one()
+    assert [h.price for h in loaded.price_history] == [1.0]
+    session.close()
+
+
+def test_price_history_inserted_in_item_id_order(temp_sqlite_db):
+    engine = create_engine(temp_sqlite_db, future=True)
+    now = datetime.now(timezone.utc)
+    records = [
+        {"item_id": item_id, "current_price": price, "updated_at": now}
+        for item_id, price in [("B", 1.0), ("A", 2.0), ("C", 3.0), ("A", 4.0)]
+    ]
+    load_items_to_db(records, engine=engine)
+
+    session = Session(engine)
+    rows = session.scalars(select(PriceHistory).order_by(PriceHistory.id)).all()
+    assert [(h.item_id, h.price) for h in rows] == [
+        ("A", 2.0),
+        ("A", 4.0),
+        ("B", 1.0),
+        ("C", 3.0),
+    ]
+    session.close()
+
+
+def test_money_columns_are_fixed_point_on_postgres(temp_sqlite_db):
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateTable
+
+    ddl = str(CreateTable(Order.__table__).compile(dialect=postgresql.dialect()))
+    assert "total_amount NUMERIC(12, 2)" in ddl
+
+    # SQLite keeps REAL storage, so whole amounts still come back as floats
+    engine = create_engine(temp_sqlite_db, future=True)
+    load_items_to_db(
+        [
+            {
+                "item_id": "T7",
+                "current_price": 10.0,
+                "updated_at": datetime.now(timezone.utc),
+            }
+        ],
+        engine=engine,
+    )
+    session = Session(engine)
+    price = session.get(Item, "T7").current_price
+    assert price == 10.0 and isinstance(price, float)
+    session.close()
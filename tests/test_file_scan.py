@@ -0,0 +1,51 @@
+import os
+
+from scripts import file_scan
+from scripts.file_scan import walk_files
+
+
+def test_walk_files_skips_directories_it_cannot_list(tmp_path, monkeypatch):
+    (tmp_path / "ok").mkdir()
+    (tmp_path / "ok" / "a.py").write_text("x = 1\n")
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "locked" / "b.py").write_text("x = 2\n")
+    (tmp_path / "skipped").mkdir()
+    (tmp_path / "skipped" / "c.py").write_text("x = 3\n")
+
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.path.basename(path) == "locked":
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(file_scan.os, "scandir", scandir)
+
+    names = [entry.name for entry in walk_files(str(tmp_path), skip={"skipped"})]
+    assert names == ["a.py"]
+
+
+def test_walk_files_missing_root_yields_nothing(tmp_path):
+    assert list(walk_files(str(tmp_path / "gone"))) == []
+
+
+def test_combine_skips_file_with_bad_bytes_after_first_chunk(tmp_path, capsys):
+    from scripts.combine_py_to_md import combine_to_md, find_py_files
+
+    good = tmp_path / "good.py"
+    good.write_text("".join(f"x{n} = {n}\n" for n in range(10)))
+    # Valid lines well past the line check's first read, then invalid UTF-8
+    bad = tmp_path / "bad.py"
+    bad.write_bytes(b"y = 0\n" * 50_000 + b"\xff\xfe broken\n")
+
+    files = find_py_files(str(tmp_path), exclude_dirs=set(), exclude_files=set())
+    assert sorted(os.path.basename(f) for f in files) == ["bad.py", "good.py"]
+
+    output = tmp_path / "combined.md"
+    combine_to_md([str(bad), str(good)], str(output))
+
+    combined = output.read_text(encoding="utf-8")
+    assert combined.startswith(f"```python\n# --- {good}\nx0 = 0\n")
+    assert "y = 0" not in combined
+    assert combined.endswith("```")
+    assert f"Warning: could not read {bad}" in capsys.readouterr().out
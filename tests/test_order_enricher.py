@@ -2,11 +2,12 @@
 """Tests for order enrichment functionality."""
 import pytest
 from datetime import datetime, timezone
-import pytz
 from src.transformers.order_enricher import (
+    SAO_PAULO_TZ,
     enrich_order,
     enrich_orders,
     enrich_orders_from_json,
+    enrich_orders_parallel,
     _parse_ml_datetime,
     _normalize_to_sao_paulo,
     _calculate_profit_margin,
@@ -100,6 +101,15 @@ class TestDatetimeUtilities:
         assert isinstance(result, datetime)
         assert result.tzinfo is not None
 
+    def test_parse_ml_datetime_utc_suffix(self):
+        """Test parsing a 'Z'-suffixed datetime and converting to a given zone."""
+        result = _parse_ml_datetime("2025-06-08T20:19:34.000Z")
+        assert result == datetime(2025, 6, 8, 20, 19, 34, tzinfo=timezone.utc)
+
+        local = _parse_ml_datetime("2025-06-08T20:19:34.000Z", SAO_PAULO_TZ)
+        assert local == result
+        assert local.tzinfo is SAO_PAULO_TZ
+
     def test_parse_ml_datetime_none(self):
         """Test parsing None datetime."""
         assert _parse_ml_datetime(None) is None
@@ -114,7 +124,7 @@ class TestDatetimeUtilities:
         result = _normalize_to_sao_paulo(utc_dt)
 
         assert result is not None
-        assert result.tzinfo.zone == "America/Sao_Paulo"
+        assert result.tzinfo.key == "America/Sao_Paulo"
 
     def test_normalize_to_sao_paulo_none(self):
         """Test normalizing None datetime."""
@@ -262,6 +272,18 @@ class TestBatchEnrichment:
 
         assert len(enriched) == 2
         assert all("order_id" in order for order in enriched)
+        # The batch shares one processing timestamp
+        assert enriched[0]["processed_at"] is enriched[1]["processed_at"]
+
+    def test_enrich_orders_parallel_matches_serial(self, sample_order):
+        """Test that the process pool returns the serial results, in order."""
+        orders = [dict(sample_order, id=n) for n in range(5)] + [None]
+        enriched = enrich_orders_parallel(orders, workers=2, chunk_size=2)
+
+        assert [order["order_id"] for order in enriched] == [0, 1, 2, 3, 4]
+        expected = enrich_orders(orders)
+        for got, want in zip(enriched, expected):
+            assert got == {**want, "processed_at": got["processed_at"]}
 
     def test_enrich_orders_empty(self):
         """Test enriching empty list."""
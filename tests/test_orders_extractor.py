@@ -1,7 +1,7 @@
 # tests/test_orders_extractor.py
 import pytest
 from types import SimpleNamespace
-from src.extractors.orders_extractor import extract_orders
+from src.extractors.orders_extractor import extract_orders, iter_orders
 from src.extractors.ml_api_client import MLClient, create_client
 
 
@@ -71,6 +71,31 @@ def test_extract_orders_empty_first_page(monkeypatch):
     assert result == []
 
 
+def test_iter_orders_yields_first_page_before_fetching_more(monkeypatch):
+    """
+    Test that iter_orders hands out orders as pages arrive and stops fetching
+    once max_records is reached.
+    """
+    offsets = []
+
+    def stub_get_orders(token, seller_id, limit=None, offset=None, **kwargs):
+        offsets.append(offset)
+        return {
+            "results": [{"id": f"o{offset + i}"} for i in range(limit)],
+            "paging": {"offset": offset, "limit": limit},
+        }
+
+    monkeypatch.setattr(
+        "src.extractors.orders_extractor.create_client",
+        lambda: (SimpleNamespace(get_orders=stub_get_orders), "tok"),
+    )
+
+    orders = iter_orders(seller_id="s", limit=2, max_records=5)
+    assert next(orders) == {"id": "o0"}
+    assert [o["id"] for o in orders] == ["o1", "o2", "o3", "o4"]
+    assert offsets == [0, 2, 4]
+
+
 def test_mlclient_get_orders_params_forwarding(monkeypatch):
     """
     Test that MLClient.get_orders forwards parameters correctly to _req.
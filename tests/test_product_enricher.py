@@ -3,10 +3,12 @@ import pytest
 from datetime import datetime, timezone
 from src.transformers.product_enricher import (
     _get_attr,
+    _index_attrs,
     _safe_divide,
     _calculate_discount_percentage,
     enrich_item,
     enrich_items,
+    enrich_items_parallel,
 )
 
 
@@ -53,6 +55,26 @@ class TestGetAttr:
         assert _get_attr(attrs, "BRAND") is None
 
 
+class TestIndexAttrs:
+    """Test cases for _index_attrs helper function."""
+
+    def test_index_attrs_matches_get_attr(self):
+        """Test that indexed values agree with _get_attr, first entry winning."""
+        attrs = [
+            {"id": "BRAND", "value_name": "Noneca"},
+            {"id": "SIZE", "value_name": None, "value_id": "P"},
+            {"id": "GENDER", "value_name": "", "value_id": ""},
+            {"id": "BRAND", "value_name": "Other"},
+        ]
+        index = _index_attrs(attrs)
+        for key in ("BRAND", "SIZE", "GENDER", "MAIN_COLOR"):
+            assert index.get(key) == _get_attr(attrs, key)
+
+    def test_index_attrs_none(self):
+        """Test indexing None attributes."""
+        assert _index_attrs(None) == {}
+
+
 class TestSafeDivide:
     """Test cases for _safe_divide helper function."""
 
@@ -249,6 +271,23 @@ class TestEnrichItems:
         assert result[1]["item_id"] == "MLB1234567"
         assert result[1]["current_price"] == 35.0
 
+    def test_enrich_items_share_batch_timestamp(self):
+        """Test that a batch is stamped with a single timestamp."""
+        result = enrich_items([{"id": "MLB1", "price": 1.0}, {"id": "MLB2"}])
+
+        assert result[0]["created_at"] is result[1]["created_at"]
+        assert result[0]["updated_at"] == result[0]["created_at"]
+
+    def test_enrich_items_parallel_matches_serial(self):
+        """Test that the process pool returns the serial results, in order."""
+        raw_items = [{"id": f"MLB{n}", "price": float(n)} for n in range(5)]
+
+        result = enrich_items_parallel(raw_items + [None], workers=2, chunk_size=2)
+
+        assert [item["item_id"] for item in result] == [f"MLB{n}" for n in range(5)]
+        assert result[4]["current_price"] == 4.0
+        assert result[0]["created_at"] == result[4]["created_at"]
+
     def test_enrich_items_empty_list(self):
         """Test enriching empty list."""
         result = enrich_items([])